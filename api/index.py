@@ -1,6 +1,9 @@
 import sys
 from pathlib import Path
 
+# The deployment bundle is read-only; don't try to write .pyc files on cold start
+sys.dont_write_bytecode = True
+
 # Add project root to sys.path so we can import from api_server.py
 # Vercel places files in /var/task/ but respects relative imports if path is set
 sys.path.append(str(Path(__file__).parent.parent))
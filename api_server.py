@@ -18,25 +18,25 @@ Endpoints:
 
 import os
 import sys
-import json
-import re
-from pathlib import Path
-from datetime import datetime
-from typing import Any, Optional
+import hmac
+import hashlib
+import logging
+from contextlib import asynccontextmanager
+from types import MappingProxyType
+from typing import Awaitable, Callable, Final, Mapping, Optional
 
 from starlette.requests import Request
 from starlette.responses import StreamingResponse
 from fastapi import FastAPI, HTTPException
+from fastapi.openapi.utils import get_openapi
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import BaseModel
-import uvicorn
+import orjson
 
-# Restore credentials from env vars (for Railway deployment)
-import auth_helper
-auth_helper.restore_credentials()
+import cache_helper
 
-# Import from MCP server
-sys.path.insert(0, str(Path(__file__).parent))
 from mcp_server import (
     handle_analyze_transcript,
     handle_generate_proposal,
@@ -58,23 +58,88 @@ from mcp_server import (
     list_tools,
     list_resources,
     read_resource,
-    PROJECT_ROOT,
-    DIRECTIVES_DIR,
     server as mcp_server_instance,
 )
 from mcp.server.sse import SseServerTransport
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm per-process state on startup and release shared clients on shutdown."""
+    # Build the static /tools and /resources payloads before the first request
+    _etag(await _tools_json())
+    _etag(await _resources_json())
+    for resource in await list_resources():
+        await _resource_json(str(resource.uri))
+    yield
+    await cache_helper.close()
+
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# SECURITY
+# =============================================================================
+
+API_KEY_NAME = "X-API-Key"
+_API_KEY_HEADER = API_KEY_NAME.lower().encode("latin-1")
+
+# Read once at import; the key doesn't change for the life of the process
+_EXPECTED_KEY: Optional[str] = os.getenv("MCP_API_KEY") or None
+
+_FORBIDDEN_BODY = orjson.dumps({"detail": "Could not validate credentials"})
+
+
+class APIKeyMiddleware:
+    """
+    Pure ASGI check of the X-API-Key header on POST /tools/* requests.
+    A no-op when no key is configured.
+    """
+
+    def __init__(self, app, key: Optional[str]):
+        self.app = app
+        self.key = key.encode() if key else None
+
+    async def __call__(self, scope, receive, send):
+        if (
+            self.key is not None
+            and scope["type"] == "http"
+            and scope["method"] == "POST"
+            and scope["path"].startswith("/tools/")
+        ):
+            provided = next((v for k, v in scope["headers"] if k == _API_KEY_HEADER), b"")
+            # Constant-time compare so the key can't be recovered from response timing
+            if not hmac.compare_digest(provided, self.key):
+                await send({
+                    "type": "http.response.start",
+                    "status": 403,
+                    "headers": [
+                        (b"content-type", b"application/json"),
+                        (b"content-length", str(len(_FORBIDDEN_BODY)).encode()),
+                    ],
+                })
+                await send({"type": "http.response.body", "body": _FORBIDDEN_BODY})
+                return
+        await self.app(scope, receive, send)
+
+
 # Initialize FastAPI
 app = FastAPI(
+    lifespan=lifespan,
     title="InstantProd Proposal Generator API",
     description="REST API for the proposal generation workflow. Connect this to ChatGPT via Custom GPT Actions.",
     version="1.0.0",
+    # orjson skips the stdlib json.dumps pass on every (often large) tool result
+    default_response_class=ORJSONResponse,
     servers=[
         {"url": "https://instantprod-proposal-gen.vercel.app", "description": "Production Server"},
         {"url": "http://localhost:8000", "description": "Local Development"}
     ]
 )
 
+# Registered before CORS so that rejected requests still get CORS headers
+app.add_middleware(APIKeyMiddleware, key=_EXPECTED_KEY)
+
 # Enable CORS for ChatGPT and other clients
 app.add_middleware(
     CORSMiddleware,
@@ -85,24 +150,100 @@ app.add_middleware(
 )
 
 
+class SSESafeGZipMiddleware(GZipMiddleware):
+    """GZip responses, except the MCP SSE stream (buffering would stall events)."""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in ("/sse", "/messages"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+# Tool results (sheet dumps, proposal HTML, listings) are large, repetitive
+# text; small bodies aren't worth the CPU so they go out uncompressed.
+app.add_middleware(SSESafeGZipMiddleware, minimum_size=1024, compresslevel=5)
+
+
 # =============================================================================
-# SECURITY
+# OPENAPI
 # =============================================================================
-from fastapi import Depends, Security
-from fastapi.security import APIKeyHeader
 
-API_KEY_NAME = "X-API-Key"
-api_key_header = APIKeyHeader(name=API_KEY_NAME, auto_error=False)
-
-async def verify_api_key(api_key: str = Security(api_key_header)):
-    """Verify API key if configured."""
-    expected_key = os.getenv("MCP_API_KEY")
-    if expected_key and api_key != expected_key:
-        raise HTTPException(
-            status_code=403,
-            detail="Could not validate credentials"
-        )
-    return api_key
+def custom_openapi() -> dict:
+    """
+    OpenAPI schema with the X-API-Key scheme declared on the protected tool
+    routes (auth is enforced by APIKeyMiddleware, so FastAPI can't infer it).
+    """
+    if app.openapi_schema:
+        return app.openapi_schema
+    schema = get_openapi(
+        title=app.title,
+        version=app.version,
+        description=app.description,
+        routes=app.routes,
+        servers=app.servers,
+    )
+    schema.setdefault("components", {})["securitySchemes"] = {
+        "APIKeyHeader": {"type": "apiKey", "in": "header", "name": API_KEY_NAME}
+    }
+    for path, operations in schema.get("paths", {}).items():
+        if path.startswith("/tools/") and "post" in operations:
+            operations["post"]["security"] = [{"APIKeyHeader": []}]
+    app.openapi_schema = schema
+    return schema
+
+
+app.openapi = custom_openapi
+
+# =============================================================================
+# RESPONSES
+# =============================================================================
+
+def _json_response(payload: dict) -> Response:
+    """Serialize a plain dict straight to a JSON response (no jsonable_encoder pass)."""
+    return Response(content=orjson.dumps(payload), media_type="application/json")
+
+
+def _resp(text: str) -> Response:
+    """Wrap a tool result string in the standard {"result": ...} envelope."""
+    return _json_response({"result": text})
+
+
+# Results above this size (proposal HTML, full sheet dumps) are streamed in
+# chunks so the first bytes go out before the whole body is handed over.
+STREAM_THRESHOLD = 100 * 1024
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+async def _iter_result(text: str):
+    """Yield the {"result": ...} envelope for text in STREAM_CHUNK_SIZE pieces."""
+    body = orjson.dumps(text)
+    yield b'{"result":'
+    for start in range(0, len(body), STREAM_CHUNK_SIZE):
+        yield body[start:start + STREAM_CHUNK_SIZE]
+    yield b'}'
+
+
+def _resp_large(text: str) -> Response:
+    """Like _resp, but streams results larger than STREAM_THRESHOLD."""
+    if len(text) < STREAM_THRESHOLD:
+        return _resp(text)
+    return StreamingResponse(_iter_result(text), media_type="application/json")
+
+
+# =============================================================================
+# CACHING
+# =============================================================================
+# Sheets reads are slow (hundreds of ms, seconds at p95) and rate limited, and
+# ChatGPT tends to repeat the same lookup, so they go through a short cache.
+
+cached_read_sheet = cache_helper.cached(
+    "read_sheet", ok=lambda text: not text.startswith("Sheet read failed")
+)(handle_read_sheet)
+cached_find_client = cache_helper.cached(
+    "find_client", ok=lambda text: not text.startswith(("Search failed", "Error:"))
+)(handle_find_client)
+
 
 # =============================================================================
 # MODELS
@@ -208,9 +349,6 @@ class FetchRequest(BaseModel):
     id: str
 
 
-    id: str
-
-
 # =============================================================================
 # SSE ENDPOINTS (For ChatGPT MCP Connector)
 # =============================================================================
@@ -266,85 +404,153 @@ async def get_gpt_schema():
 @app.get("/")
 async def root():
     """API root."""
-    return {
-        "name": "InstantProd Proposal Generator API",
-        "version": "1.0.0",
-        "docs": "/docs",
-        "openapi": "/openapi.json"
-    }
+    return ORJSONResponse(
+        {
+            "name": "InstantProd Proposal Generator API",
+            "version": "1.0.0",
+            "docs": "/docs",
+            "openapi": "/openapi.json"
+        },
+        headers={"Cache-Control": "public, max-age=3600, immutable"},
+    )
 
 
 @app.get("/health")
 async def health():
     """Health check endpoint."""
-    return {"status": "healthy"}
+    # Must always reach the process, never a CDN copy
+    return ORJSONResponse({"status": "healthy"}, headers={"Cache-Control": "no-store"})
+
+
+# Tool and resource metadata is static for the lifetime of the process,
+# so it is serialized once and served from memory afterwards.
+_TOOLS_JSON: Optional[bytes] = None
+_RESOURCES_JSON: Optional[bytes] = None
+# body -> ETag, filled in alongside the payloads above
+_ETAGS: dict = {}
+METADATA_CACHE_CONTROL = "public, max-age=300"
+
+
+def _etag(body: bytes) -> str:
+    """Strong ETag for a static payload (computed once per payload)."""
+    etag = _ETAGS.get(body)
+    if etag is None:
+        etag = _ETAGS[body] = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    return etag
+
+
+def _static_json_response(request: Request, body: bytes) -> Response:
+    """Serve a static JSON payload, answering 304 when the client's copy is current."""
+    etag = _etag(body)
+    headers = {"ETag": etag, "Cache-Control": METADATA_CACHE_CONTROL}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def _tools_json() -> bytes:
+    """Serialized /tools payload, built on first use."""
+    global _TOOLS_JSON
+    if _TOOLS_JSON is None:
+        tools = await list_tools()
+        _TOOLS_JSON = orjson.dumps({
+            "tools": [
+                {
+                    "name": t.name,
+                    "description": t.description,
+                    "input_schema": t.inputSchema
+                }
+                for t in tools
+            ]
+        })
+    return _TOOLS_JSON
+
+
+async def _resources_json() -> bytes:
+    """Serialized /resources payload, built on first use."""
+    global _RESOURCES_JSON
+    if _RESOURCES_JSON is None:
+        resources = await list_resources()
+        _RESOURCES_JSON = orjson.dumps({
+            "resources": [
+                {
+                    "uri": str(r.uri),
+                    "name": r.name,
+                    "description": r.description,
+                    "mime_type": r.mimeType
+                }
+                for r in resources
+            ]
+        })
+    return _RESOURCES_JSON
 
 
 @app.get("/tools")
-async def get_tools():
+async def get_tools(request: Request):
     """List all available tools."""
-    tools = await list_tools()
-    return {
-        "tools": [
-            {
-                "name": t.name,
-                "description": t.description,
-                "input_schema": t.inputSchema
-            }
-            for t in tools
-        ]
-    }
+    return _static_json_response(request, await _tools_json())
 
 
 @app.get("/resources")
-async def get_resources():
+async def get_resources(request: Request):
     """List all available resources."""
-    resources = await list_resources()
-    return {
-        "resources": [
-            {
-                "uri": r.uri,
-                "name": r.name,
-                "description": r.description,
-                "mime_type": r.mimeType
-            }
-            for r in resources
-        ]
-    }
+    return _static_json_response(request, await _resources_json())
+
+
+# Templates and directives ship with the deployment and never change at
+# runtime, so each listed resource is read and serialized at most once.
+# Unlisted URIs are not cached, which keeps the dict bounded.
+_RESOURCE_CACHE: dict = {}
+_RESOURCE_URIS: Optional[frozenset] = None
+
+
+async def _resource_json(uri: str) -> bytes:
+    """Serialized {"uri", "content"} body for a resource."""
+    global _RESOURCE_URIS
+    body = _RESOURCE_CACHE.get(uri)
+    if body is not None:
+        return body
+    body = orjson.dumps({"uri": uri, "content": await read_resource(uri)})
+    if _RESOURCE_URIS is None:
+        _RESOURCE_URIS = frozenset(str(r.uri) for r in await list_resources())
+    if uri in _RESOURCE_URIS:
+        _RESOURCE_CACHE[uri] = body
+    return body
 
 
 @app.get("/resources/{uri:path}")
 async def get_resource(uri: str):
     """Read a specific resource."""
-    content = await read_resource(uri)
-    return {"uri": uri, "content": content}
+    return Response(content=await _resource_json(uri), media_type="application/json")
 
 
 # Tool-specific endpoints for better OpenAPI schema generation
-# All endpoints protected by API Key if set
+# POST endpoints are protected by API Key if set (see APIKeyMiddleware)
+# Request models are flat and already validated, so handlers get the model's
+# own field dict (request.__dict__) rather than a model_dump() copy.
 
-@app.post("/tools/analyze_transcript", dependencies=[Depends(verify_api_key)])
+@app.post("/tools/analyze_transcript")
 async def analyze_transcript(request: AnalyzeTranscriptRequest):
     """Analyze a call transcript using AI to extract structured proposal data."""
-    result = await handle_analyze_transcript(request.model_dump())
-    return {"result": result[0].text}
+    result = await handle_analyze_transcript(request.__dict__)
+    return _resp(result[0].text)
 
 
-@app.post("/tools/generate_proposal", dependencies=[Depends(verify_api_key)])
+@app.post("/tools/generate_proposal")
 async def generate_proposal(request: GenerateProposalRequest):
     """Generate an HTML proposal from client data."""
-    result = await handle_generate_proposal(request.model_dump())
-    return {"result": result[0].text}
+    result = await handle_generate_proposal(request.__dict__)
+    return _resp_large(result[0].text)
 
 
-@app.post("/tools/deploy_proposal", dependencies=[Depends(verify_api_key)])
+@app.post("/tools/deploy_proposal")
 async def deploy_proposal(request: DeployProposalRequest):
     """Deploy a generated proposal to Vercel."""
-    result = await handle_deploy_proposal(request.model_dump())
-    return {"result": result[0].text}
+    result = await handle_deploy_proposal(request.__dict__)
+    return _resp(result[0].text)
 
 
-@app.post("/tools/send_proposal_email", dependencies=[Depends(verify_api_key)])
+@app.post("/tools/send_proposal_email")
 async def send_proposal_email(request: SendEmailRequest):
     """Send a branded email with the proposal link via Gmail."""
     result = await handle_send_email({
@@ -353,10 +559,10 @@ async def send_proposal_email(request: SendEmailRequest):
         "proposal_link": request.proposal_link,
         "subject": request.subject
     })
-    return {"result": result[0].text}
+    return _resp(result[0].text)
 
 
-@app.post("/tools/send_trello_invite_email", dependencies=[Depends(verify_api_key)])
+@app.post("/tools/send_trello_invite_email")
 async def send_trello_invite_email(request: SendTrelloInviteEmailRequest):
     """Send a branded email with the Trello board link via Gmail."""
     result = await handle_send_trello_invite_email({
@@ -365,125 +571,131 @@ async def send_trello_invite_email(request: SendTrelloInviteEmailRequest):
         "trello_link": request.trello_link,
         "subject": request.subject
     })
-    return {"result": result[0].text}
+    return _resp(result[0].text)
 
 
-@app.post("/tools/send_plain_email", dependencies=[Depends(verify_api_key)])
+@app.post("/tools/send_plain_email")
 async def send_plain_email(request: SendPlainEmailRequest):
     """Send a plain text email via Gmail."""
-    result = await handle_send_plain_email(request.model_dump())
-    return {"result": result[0].text}
+    result = await handle_send_plain_email(request.__dict__)
+    return _resp(result[0].text)
 
 
-@app.post("/tools/quick_proposal", dependencies=[Depends(verify_api_key)])
+@app.post("/tools/quick_proposal")
 async def quick_proposal(request: QuickProposalRequest):
     """Run the full proposal pipeline (analyze → generate → deploy)."""
-    result = await handle_quick_proposal(request.model_dump())
-    return {"result": result[0].text}
+    result = await handle_quick_proposal(request.__dict__)
+    return _resp(result[0].text)
 
 
-@app.post("/tools/read_sheet", dependencies=[Depends(verify_api_key)])
+@app.post("/tools/read_sheet")
 async def read_sheet(request: ReadSheetRequest):
     """Read data from the Google Sheets database."""
-    result = await handle_read_sheet(request.model_dump())
-    return {"result": result[0].text}
+    result = await cached_read_sheet(request.model_dump(exclude_none=True))
+    return _resp_large(result[0].text)
 
 
-@app.post("/tools/find_client", dependencies=[Depends(verify_api_key)])
+@app.post("/tools/find_client")
 async def find_client(request: FindClientRequest):
     """Search for a client in the database."""
-    result = await handle_find_client(request.model_dump())
-    return {"result": result[0].text}
+    result = await cached_find_client(request.__dict__)
+    return _resp(result[0].text)
 
 
-@app.post("/tools/list_proposals", dependencies=[Depends(verify_api_key)])
+@app.post("/tools/list_proposals")
 async def list_proposals_endpoint(request: ListRequest = ListRequest()):
     """List all generated proposals."""
-    result = await handle_list_proposals(request.model_dump())
-    return {"result": result[0].text}
+    result = await handle_list_proposals(request.__dict__)
+    return _resp_large(result[0].text)
 
 
-@app.post("/tools/list_transcripts", dependencies=[Depends(verify_api_key)])
+@app.post("/tools/list_transcripts")
 async def list_transcripts_endpoint(request: ListRequest = ListRequest()):
     """List all saved transcripts."""
-    result = await handle_list_transcripts(request.model_dump())
-    return {"result": result[0].text}
+    result = await handle_list_transcripts(request.__dict__)
+    return _resp_large(result[0].text)
 
 
 @app.get("/tools/last_deployment_url")
 async def get_last_deployment_url():
     """Get the URL of the most recently deployed proposal."""
     result = await handle_get_last_url({})
-    return {"result": result[0].text}
+    return _resp(result[0].text)
 
 
-@app.post("/tools/sync_to_drive", dependencies=[Depends(verify_api_key)])
+@app.post("/tools/sync_to_drive")
 async def sync_to_drive():
     """Sync all local proposal files to Google Drive."""
     result = await handle_sync_to_drive({})
-    return {"result": result[0].text}
+    await cache_helper.invalidate()
+    return _resp(result[0].text)
 
 
-@app.post("/tools/list_drive_files", dependencies=[Depends(verify_api_key)])
+@app.post("/tools/list_drive_files")
 async def list_drive_files(request: ListDriveFilesRequest = ListDriveFilesRequest()):
     """List files stored in Google Drive."""
-    result = await handle_list_drive_files(request.model_dump())
-    return {"result": result[0].text}
+    result = await handle_list_drive_files(request.__dict__)
+    return _resp(result[0].text)
 
 
-@app.post("/tools/download_from_drive", dependencies=[Depends(verify_api_key)])
+@app.post("/tools/download_from_drive")
 async def download_from_drive(request: DownloadFromDriveRequest):
     """Download a file from Google Drive to local storage."""
-    result = await handle_download_from_drive(request.model_dump())
-    return {"result": result[0].text}
+    result = await handle_download_from_drive(request.__dict__)
+    return _resp(result[0].text)
 
 
-@app.post("/tools/search", dependencies=[Depends(verify_api_key)])
+@app.post("/tools/search")
 async def search(request: SearchRequest):
     """Search for items (ChatGPT Connector Standard)."""
-    result = await handle_search(request.model_dump())
+    result = await handle_search(request.__dict__)
     # ChatGPT expects a specific JSON format inside the text property
     # The handler already returns it as a JSON string
-    return {"result": result[0].text}
+    return _resp(result[0].text)
 
 
-@app.post("/tools/fetch", dependencies=[Depends(verify_api_key)])
+@app.post("/tools/fetch")
 async def fetch(request: FetchRequest):
     """Fetch item content (ChatGPT Connector Standard)."""
-    result = await handle_fetch(request.model_dump())
-    return {"result": result[0].text}
+    result = await handle_fetch(request.__dict__)
+    return _resp(result[0].text)
 
 
 # Generic tool endpoint (for flexibility)
-@app.post("/tools/{tool_name}", dependencies=[Depends(verify_api_key)])
+# Built once at import as a read-only view; registered last so the explicit
+# routes above win.
+HANDLERS: Final[Mapping[str, Callable[[dict], Awaitable[list]]]] = MappingProxyType({
+    "analyze_transcript": handle_analyze_transcript,
+    "generate_proposal": handle_generate_proposal,
+    "deploy_proposal": handle_deploy_proposal,
+    "send_proposal_email": handle_send_email,
+    "send_plain_email": handle_send_plain_email,
+    "send_trello_invite_email": handle_send_trello_invite_email,
+    "quick_proposal": handle_quick_proposal,
+    "read_sheet": cached_read_sheet,
+    "find_client": cached_find_client,
+    "list_proposals": handle_list_proposals,
+    "list_transcripts": handle_list_transcripts,
+    "get_last_deployment_url": handle_get_last_url,
+    "sync_to_drive": handle_sync_to_drive,
+    "list_drive_files": handle_list_drive_files,
+    "download_from_drive": handle_download_from_drive,
+    "search": handle_search,
+    "fetch": handle_fetch,
+})
+
+
+@app.post("/tools/{tool_name}")
 async def execute_tool(tool_name: str, request: ToolRequest):
     """Execute any tool by name with arbitrary arguments."""
-    handlers = {
-        "analyze_transcript": handle_analyze_transcript,
-        "generate_proposal": handle_generate_proposal,
-        "deploy_proposal": handle_deploy_proposal,
-        "send_proposal_email": handle_send_email,
-        "send_plain_email": handle_send_plain_email,
-        "send_trello_invite_email": handle_send_trello_invite_email,
-        "quick_proposal": handle_quick_proposal,
-        "read_sheet": handle_read_sheet,
-        "find_client": handle_find_client,
-        "list_proposals": handle_list_proposals,
-        "list_transcripts": handle_list_transcripts,
-        "get_last_deployment_url": handle_get_last_url,
-        "sync_to_drive": handle_sync_to_drive,
-        "list_drive_files": handle_list_drive_files,
-        "download_from_drive": handle_download_from_drive,
-        "search": handle_search,
-        "fetch": handle_fetch,
-    }
-    
-    handler = handlers.get(tool_name)
+    handler = HANDLERS.get(tool_name)
     if not handler:
         raise HTTPException(status_code=404, detail=f"Tool '{tool_name}' not found")
     
     result = await handler(request.arguments)
-    return {"result": result[0].text}
+    if tool_name == "sync_to_drive":
+        await cache_helper.invalidate()
+    return _resp(result[0].text)
 
 
 # =============================================================================
@@ -491,20 +703,36 @@ async def execute_tool(tool_name: str, request: ToolRequest):
 # =============================================================================
 
 if __name__ == "__main__":
+    # Only needed when running standalone; serverless hosts import `app` directly
+    import uvicorn
+
     port = int(os.getenv("PORT", 8000))
-    print(f"""
-╔═══════════════════════════════════════════════════════════╗
-║     InstantProd Proposal Generator - API Server           ║
-╠═══════════════════════════════════════════════════════════╣
-║  Local:    http://localhost:{port}                          ║
-║  Docs:     http://localhost:{port}/docs                     ║
-║  OpenAPI:  http://localhost:{port}/openapi.json             ║
-╚═══════════════════════════════════════════════════════════╝
-
-To connect ChatGPT:
-1. Go to chat.openai.com → Explore GPTs → Create a GPT
-2. In the Configure tab, add an Action
-3. Use the OpenAPI schema from http://localhost:{port}/openapi.json
-4. For production, deploy this to a public URL (Vercel, Railway, etc.)
-""")
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logger.info(
+        f"InstantProd Proposal Generator API on http://localhost:{port} "
+        f"(docs: /docs, OpenAPI schema for ChatGPT Actions: /openapi.json)"
+    )
+    workers = os.getenv("WEB_CONCURRENCY")
+    if workers and not os.getenv("VERCEL") and sys.platform != "win32":
+        # Long-running hosts (Railway, VMs): one Uvicorn worker process per
+        # core under Gunicorn's process manager. Replaces this process.
+        os.execvp("gunicorn", [
+            "gunicorn", "api_server:app",
+            "--worker-class", "uvicorn.workers.UvicornWorker",
+            "--workers", workers,
+            "--bind", f"0.0.0.0:{port}",
+            "--log-level", "warning",
+            "--keep-alive", "5",
+        ])
+
+    # Pass the app object: an import string would load this module a second time
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=port,
+        # uvloop has no Windows build; fall back to the stock asyncio loop there
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        access_log=False,
+        log_level="warning",
+    )
@@ -1,11 +1,16 @@
 """
 Helper to restore Google Cloud credentials from environment variables.
 Use this in Railway/Cloud deployments where we can't store .json files.
+
+The base64 env vars are decoded once per process and used in memory;
+nothing is written to disk unless a refreshed token is saved.
 """
 import os
 import json
 import base64
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 
 PROJECT_ROOT = Path(__file__).parent
 
@@ -15,41 +20,58 @@ def get_writable_path(filename: str) -> Path:
         return Path("/tmp") / filename
     return PROJECT_ROOT / filename
 
-def restore_credentials():
-    """Restore credentials.json and token.json from env vars if needed."""
-    
-    # Restore credentials.json
-    creds_path = get_writable_path('credentials.json')
-    
-    # Only try to restore if file doesn't exist
-    if not creds_path.exists():
-        encoded_creds = os.getenv("GOOGLE_CREDENTIALS_BASE64")
-        if encoded_creds:
-            try:
-                print(f"🔑 Restoring credentials.json to {creds_path}...")
-                decoded = base64.b64decode(encoded_creds).decode('utf-8')
-                with open(creds_path, 'w') as f:
-                    f.write(decoded)
-            except Exception as e:
-                print(f"⚠️ Failed to restore credentials: {e}")
-
-    # Restore token.json
-    token_path = get_writable_path('token.json')
-    if not token_path.exists():
-        encoded_token = os.getenv("GOOGLE_TOKEN_BASE64")
-        if encoded_token:
-            try:
-                print(f"🔑 Restoring token.json to {token_path}...")
-                decoded = base64.b64decode(encoded_token).decode('utf-8')
-                with open(token_path, 'w') as f:
-                    f.write(decoded)
-            except Exception as e:
-                print(f"⚠️ Failed to restore token: {e}")
-                
-    # Set standard env var so Google libraries find the credentials
-    # os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = str(creds_path) 
-    # (Optional, but our scripts usually look for the file specifically)
-    return creds_path, token_path
+def _decode_env_json(name: str) -> Optional[dict]:
+    """Decode a base64-encoded JSON env var, or None if unset/invalid."""
+    encoded = os.getenv(name)
+    if not encoded:
+        return None
+    try:
+        return json.loads(base64.b64decode(encoded))
+    except Exception as e:
+        print(f"⚠️ Failed to decode {name}: {e}")
+        return None
+
+@lru_cache(maxsize=1)
+def get_credentials_info() -> Optional[dict]:
+    """OAuth client config (credentials.json contents) from GOOGLE_CREDENTIALS_BASE64."""
+    return _decode_env_json("GOOGLE_CREDENTIALS_BASE64")
+
+@lru_cache(maxsize=1)
+def get_token_info() -> Optional[dict]:
+    """Authorized user info (token.json contents) from GOOGLE_TOKEN_BASE64."""
+    return _decode_env_json("GOOGLE_TOKEN_BASE64")
+
+def load_user_credentials(token_path: Path, scopes: list):
+    """
+    Load OAuth user credentials.
+    Prefers token_path (it holds the latest refreshed token), then falls back
+    to the in-memory GOOGLE_TOKEN_BASE64 info. Returns None if neither exists.
+    """
+    from google.oauth2.credentials import Credentials
+
+    if token_path.exists():
+        return Credentials.from_authorized_user_file(str(token_path), scopes)
+    info = get_token_info()
+    if info:
+        return Credentials.from_authorized_user_info(info, scopes)
+    return None
+
+def get_client_flow(creds_path: Path, scopes: list):
+    """Build the interactive OAuth flow from credentials.json or GOOGLE_CREDENTIALS_BASE64."""
+    from google_auth_oauthlib.flow import InstalledAppFlow
+
+    if creds_path.exists():
+        return InstalledAppFlow.from_client_secrets_file(str(creds_path), scopes)
+    info = get_credentials_info()
+    if info:
+        return InstalledAppFlow.from_client_config(info, scopes)
+    raise FileNotFoundError(f"credentials.json not found at {creds_path}")
+
+def credential_paths():
+    """Return the credentials.json and token.json paths (under /tmp on Vercel)."""
+    return get_writable_path('credentials.json'), get_writable_path('token.json')
 
 if __name__ == "__main__":
-    restore_credentials()
+    creds_path, token_path = credential_paths()
+    print(f"credentials: {creds_path} (env: {'yes' if get_credentials_info() else 'no'})")
+    print(f"token:       {token_path} (env: {'yes' if get_token_info() else 'no'})")
@@ -0,0 +1,154 @@
+"""
+Cache-aside helper for the HTTP API.
+Uses Redis when REDIS_URL is set (shared across workers/instances), otherwise
+falls back to an in-process TTL cache (Vercel cold path, local dev).
+"""
+import os
+import time
+import logging
+import hashlib
+import functools
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+import orjson
+from mcp.types import TextContent
+
+try:
+    import redis.asyncio as aioredis
+    from redis.exceptions import RedisError
+except ImportError:
+    aioredis = None
+    RedisError = ConnectionError  # unused without redis
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = int(os.getenv("TOOL_CACHE_TTL", "120"))
+MAX_MEMORY_ENTRIES = 256
+VERSION_KEY = "instantprod:cache:version"
+
+# key -> (expires_at, text)
+_memory: Dict[str, Tuple[float, str]] = {}
+_memory_version = 0
+_redis = None
+_redis_error_logged = False
+
+
+def _redis_failed(e: Exception) -> None:
+    """Note a Redis failure; the cache is optional, so callers carry on without it."""
+    global _redis_error_logged
+    if not _redis_error_logged:
+        _redis_error_logged = True
+        logger.warning("Redis cache unavailable, continuing uncached: %s", e)
+
+
+def _get_redis():
+    """Return a shared Redis client, or None when Redis isn't configured."""
+    global _redis
+    url = os.getenv("REDIS_URL")
+    if not url or aioredis is None:
+        return None
+    if _redis is None:
+        _redis = aioredis.Redis.from_url(url)
+    return _redis
+
+
+async def close() -> None:
+    """Close the shared Redis connection pool (call on app shutdown)."""
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+
+
+def make_key(namespace: str, args: dict) -> str:
+    """Stable cache key for a tool call (argument order doesn't matter)."""
+    blob = orjson.dumps(args, option=orjson.OPT_SORT_KEYS)
+    return f"instantprod:{namespace}:{hashlib.blake2b(blob, digest_size=16).hexdigest()}"
+
+
+async def _versioned(key: str) -> str:
+    redis = _get_redis()
+    if redis is None:
+        return f"{key}:v{_memory_version}"
+    try:
+        version = await redis.get(VERSION_KEY)
+    except RedisError as e:
+        _redis_failed(e)
+        version = None
+    return f"{key}:v{int(version) if version else 0}"
+
+
+async def get(key: str) -> Optional[str]:
+    """Return the cached text for key, or None on a miss."""
+    key = await _versioned(key)
+    redis = _get_redis()
+    if redis is not None:
+        try:
+            value = await redis.get(key)
+        except RedisError as e:
+            _redis_failed(e)
+            return None
+        return value.decode("utf-8") if value is not None else None
+
+    entry = _memory.get(key)
+    if entry is None:
+        return None
+    expires_at, text = entry
+    if expires_at < time.monotonic():
+        _memory.pop(key, None)
+        return None
+    return text
+
+
+async def put(key: str, text: str, ttl: int = DEFAULT_TTL) -> None:
+    """Store text under key for ttl seconds."""
+    key = await _versioned(key)
+    redis = _get_redis()
+    if redis is not None:
+        try:
+            await redis.set(key, text.encode("utf-8"), ex=ttl)
+        except RedisError as e:
+            _redis_failed(e)
+        return
+    now = time.monotonic()
+    if len(_memory) >= MAX_MEMORY_ENTRIES:
+        for stale in [k for k, (expires_at, _) in _memory.items() if expires_at < now]:
+            del _memory[stale]
+        if len(_memory) >= MAX_MEMORY_ENTRIES:
+            _memory.pop(next(iter(_memory)))
+    _memory[key] = (now + ttl, text)
+
+
+async def invalidate() -> None:
+    """Drop every cached entry by bumping the cache version."""
+    global _memory_version
+    _memory_version += 1
+    _memory.clear()
+    redis = _get_redis()
+    if redis is not None:
+        try:
+            await redis.incr(VERSION_KEY)
+        except RedisError as e:
+            _redis_failed(e)
+
+
+def cached(namespace: str, ttl: int = DEFAULT_TTL, ok: Callable[[str], bool] = lambda text: True):
+    """
+    Wrap an async tool handler (args -> list[TextContent]) with cache-aside.
+    Results for which ok(text) is False (errors) are never cached.
+    """
+    def decorator(handler: Callable[[dict], Awaitable[list[TextContent]]]):
+        @functools.wraps(handler)
+        async def wrapper(args: dict) -> list[TextContent]:
+            key = make_key(namespace, args)
+            text = await get(key)
+            if text is not None:
+                return [TextContent(type="text", text=text)]
+
+            result = await handler(args)
+            text = result[0].text
+            if ok(text):
+                await put(key, text, ttl)
+            return result
+        return wrapper
+    return decorator
@@ -1,10 +1,27 @@
 import os
 import sys
 import json
+import asyncio
+import functools
+import time
 import click
 from pathlib import Path
 from dotenv import load_dotenv
-import openai
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
 
 # Add project root to path
 PROJECT_ROOT = Path(__file__).parent.parent
@@ -12,156 +29,534 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 load_dotenv()
 
-SYSTEM_PROMPT = """
-You are an expert sales engineer. Your goal is to extract structured data from a transcript to populate a high-design HTML proposal for Instantprod, a B2B subscription web design and development studio.
-
-Business context (for consistency only; do not restate full legal text):
-- Instantprod works with founders and small teams on a flat monthly subscription.
-- Clients own their code, repos, and infrastructure; there is no vendor lock-in.
-- Work is delivered on the client's stack as an independent contractor.
-- Client and lead data is handled under our Privacy Policy and Data Processing terms; we do not sell personal data.
-
-VOICE & POV (CRITICAL):
-- Write the proposal copy as if InstantProd is speaking directly to the business owner / decision maker.
-- Use first-person plural for InstantProd ("we", "our", "us") and second-person for the client ("you", "your").
-- Keep it confident and specific to the transcript. Do not sound like a third-party narrator (avoid "they" / "the client" / "InstantProd will").
-- Example tone:
-  - problem: "You're losing qualified leads because ..."
-  - solution: "We'll redesign ... so you can ..."
-
-CRITICAL: You must output PURE JSON. No markdown. No `json` wrappers.
-
-Guardrails for UI Integrity:
-1. **Brevity is King**: The UI breaks if text is too long. Keep "problem" and "solution" to MAX 2 sentences.
-2. **Exact Counts**: 
-   - `goals`: Return at least 3 items and include all distinct goals mentioned in the transcript. There is no maximum, but keep each goal short.
-   - `why_us`: MUST have exactly 2 items.
-   - `invest_notes`: MUST have exactly 4 short bullet points.
-3. **Cleaning**: Do NOT use markdown bolding (e.g. `**text**`). Use HTML `<strong>` if absolutely necessary, but prefer plain text.
-4. **Defaults & Pricing**:
-   - Never hallucinate numeric prices or budgets.
-   - Always map the call to one flat monthly plan where possible by setting `investment` to **one** of:
-       * "Starter subscription - flat monthly plan"
-       * "Growth subscription - flat monthly plan"
-       * "Strategic Partner subscription - flat monthly plan"
-   - Use these heuristics:
-       * Starter: small team, single brand, mainly marketing site or simple product site, light forms, no multi-portal or heavy integrations.
-       * Growth: growing team or multiple stakeholders, ongoing backlog/experiments, multiple brands/seats, or recurring CRO/feature work on an existing product site.
-       * Strategic Partner: complex build such as multi-portal or multi-tenant apps, enterprise RFPs, logistics/operations portals, significant back-end work, or multiple deep integrations (e.g. CRM/ERP, real-time tracking, vendor/carrier portals).
-   - Only if the transcript is genuinely too ambiguous to decide, set `investment` to "Flat monthly subscription - plan to be confirmed".
-
-SCHEMA & CONSTRAINTS (backend or other inputs will set `date`, `prepared_by`, and `website`; do NOT include those fields):
-{
-  "client_name": "Inferred Company Name",
-  
-  "goals": [
-    "Short goal 1 (Max 12 words)",
-    "Short goal 2 (Max 12 words)"
-  ],
-  
-  "problem": "MAX 30 words. Core pain point summary.",
-  "problem_point_1": "MAX 15 words. First specific problem factor.",
-  "problem_point_2": "MAX 15 words. Second specific problem factor.",
-  "problem_point_3": "MAX 15 words. Third specific problem factor.",
-  "problem_point_4": "MAX 15 words. Fourth specific problem factor.",
-  
-  "solution": "MAX 30 words. High-level solution pitch.",
-  "deliverables": "A single string with items separated by <br>. Example: '1. Dashboard<br>2. API Integration'. MAX 4 items.",
-  "timeline": "MAX 5 words. E.g. '4 Weeks'.",
-  
-  "why_us": [
-    {"title": "Constraint: Max 3 words", "body": "Constraint: Max 15 words"},
-    {"title": "Constraint: Max 3 words", "body": "Constraint: Max 15 words"}
-  ],
-  
-  "process_steps": [
-    {"num": "01", "title": "Max 3 words", "what": "Max 5 words", "why": "Max 10 words"},
-    {"num": "02", "title": "Max 3 words", "what": "Max 5 words", "why": "Max 10 words"},
-    {"num": "03", "title": "Max 3 words", "what": "Max 5 words", "why": "Max 10 words"}
-  ],
-  
-  "investment": "One of the plan strings above (Starter/Growth/Strategic Partner) or 'Flat monthly subscription - plan to be confirmed' (no numeric amounts).",
-  "bank_details": "Scotiabank<br>Name: Addis Ellis<br>Account: 90175 000853932<br>Transit: 90175",
-  "min_term_label": "Timeline",
-  "min_term_value": "Duration",
-  
-  "invest_notes": [
-    "Short note 1 (Max 10 words)",
-    "Short note 2 (Max 10 words)",
-    "Short note 3 (Max 10 words)",
-    "Short note 4 (Max 10 words)"
-  ],
-  
-  "signature_instruction": "Please sign below to execute this agreement."
+from prompts import get_prompt
+
+SYSTEM_PROMPT = get_prompt("proposal")
+
+# Machine-checkable subset of the schema in SYSTEM_PROMPT (required fields,
+# types and exact counts; word limits are left to the prompt)
+_STRING = {"type": "string"}
+PROPOSAL_SCHEMA = {
+    "type": "object",
+    "required": [
+        "client_name", "goals", "problem",
+        "problem_point_1", "problem_point_2", "problem_point_3", "problem_point_4",
+        "solution", "deliverables", "timeline", "why_us", "process_steps",
+        "investment", "invest_notes",
+    ],
+    "properties": {
+        "client_name": _STRING,
+        "goals": {"type": "array", "items": _STRING, "minItems": 1},
+        "problem": _STRING,
+        "problem_point_1": _STRING,
+        "problem_point_2": _STRING,
+        "problem_point_3": _STRING,
+        "problem_point_4": _STRING,
+        "solution": _STRING,
+        "deliverables": _STRING,
+        "timeline": _STRING,
+        "why_us": {
+            "type": "array", "minItems": 2, "maxItems": 2,
+            "items": {
+                "type": "object",
+                "required": ["title", "body"],
+                "properties": {"title": _STRING, "body": _STRING},
+            },
+        },
+        "process_steps": {
+            "type": "array", "minItems": 1,
+            "items": {
+                "type": "object",
+                "required": ["num", "title", "what", "why"],
+                "properties": {"num": _STRING, "title": _STRING, "what": _STRING, "why": _STRING},
+            },
+        },
+        "investment": _STRING,
+        "invest_notes": {"type": "array", "items": _STRING, "minItems": 4, "maxItems": 4},
+    },
 }
-"""
+
+# Compiled once at import into plain Python checks; None if fastjsonschema
+# isn't installed (validation is then skipped)
+validate_proposal = fastjsonschema.compile(PROPOSAL_SCHEMA) if fastjsonschema else None
+
+# Bump when SYSTEM_PROMPT changes so old cached prefixes aren't targeted
+PROMPT_CACHE_KEY = "instantprod-analyze-transcript-v1"
+
+# Transcripts per prompt in --dir mode; returns diminish (and output quality
+# drops) past a handful per call
+MAX_GROUP_SIZE = 8
+
+# Concurrent API calls in --dir mode; raise it if your rate limit allows
+DEFAULT_CONCURRENCY = 8
+
+# --model auto: smallest model whose token ceiling fits the input, else the
+# fallback. Short transcripts don't need a bigger model to fill the schema.
+AUTO_MODEL_TIERS = [
+    (4000, "gpt-5-nano"),
+    (16000, "gpt-4o-mini"),
+]
+AUTO_MODEL_FALLBACK = "gpt-5-mini"
+
+# Low temperature for schema extraction; reasoning models (gpt-5*, o*) only
+# accept the default and reject the parameter outright
+EXTRACTION_TEMPERATURE = 0.2
+REASONING_MODEL_PREFIXES = ("gpt-5", "o1", "o3", "o4")
+
+# Output cap per proposal object. The schema's word limits keep a reply well
+# under ~600 tokens; the cap only stops runaway generations. Reasoning models
+# spend hidden reasoning tokens from the same budget, so they get headroom.
+MAX_OUTPUT_TOKENS = 800
+REASONING_TOKEN_HEADROOM = 6000
+
+BATCH_POLL_INITIAL = 5      # seconds
+BATCH_POLL_MAX = 300        # seconds
+BATCH_TERMINAL_STATES = {"completed", "failed", "expired", "cancelled"}
+
+
+def read_text(path):
+    """Read a UTF-8 text file with one raw read and a single decode."""
+    return Path(path).read_bytes().decode('utf-8')
+
+
+@functools.cache
+def _encoding():
+    return tiktoken.get_encoding("o200k_base")
+
+
+def count_tokens(text):
+    """Token count for text (tiktoken if installed, else a ~4 chars/token estimate)."""
+    if tiktoken is not None:
+        return len(_encoding().encode(text, disallowed_special=()))
+    return len(text) // 4
+
+
+def resolve_model(model, text):
+    """Pick a concrete model for text when model is 'auto'; otherwise return model unchanged."""
+    if model != "auto":
+        return model
+    tokens = count_tokens(text)
+    for max_tokens, tier_model in AUTO_MODEL_TIERS:
+        if tokens < max_tokens:
+            return tier_model
+    return AUTO_MODEL_FALLBACK
+
+
+def is_reasoning_model(model):
+    return model.startswith(REASONING_MODEL_PREFIXES)
+
+
+def build_user_content(transcript_text, additional_context_text=None):
+    """User message for one transcript (plus optional research context)."""
+    if additional_context_text:
+        return (
+            "Here is the transcript:\n\n"
+            f"{transcript_text}\n\n"
+            "Additional context (use this to resolve factual details and preferences when the transcript is ambiguous; still follow the schema constraints):\n\n"
+            f"{additional_context_text}"
+        )
+    return f"Here is the transcript:\n\n{transcript_text}"
+
+
+def build_messages(user_content):
+    """Chat messages for one analysis call. SYSTEM_PROMPT always goes first."""
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user_content}
+    ]
+
+
+def build_request(model, user_content, objects=1):
+    """
+    Chat completion request body, shared by the live and Batch API paths.
+    objects is how many proposal objects the reply holds (grouped prompts).
+    
+    SYSTEM_PROMPT is a fixed, byte-identical prefix (never formatted), so
+    OpenAI can reuse its cached prefill across calls; the shared
+    prompt_cache_key routes every analysis call to the same cache.
+    """
+    max_tokens = MAX_OUTPUT_TOKENS * objects
+    request = {
+        "model": model,
+        "messages": build_messages(user_content),
+        "prompt_cache_key": PROMPT_CACHE_KEY,
+        # JSON mode: the reply is always a parseable JSON object (no fences)
+        "response_format": {"type": "json_object"},
+    }
+    if is_reasoning_model(model):
+        request["max_completion_tokens"] = max_tokens + REASONING_TOKEN_HEADROOM
+    else:
+        request["max_completion_tokens"] = max_tokens
+        request["temperature"] = EXTRACTION_TEMPERATURE
+    return request
+
+
+def build_group_content(items):
+    """
+    User message asking for several transcripts at once.
+    items is a list of (id, transcript_text); the reply must be a JSON object
+    {"results": [...]} with one schema object per transcript, in the same order.
+    """
+    parts = [
+        f'Return a JSON object {{"results": [...]}} whose array has one object per transcript, '
+        f"in order ({len(items)} objects). "
+        "Each object follows the schema above and is based only on its own transcript."
+    ]
+    for num, (item_id, transcript_text) in enumerate(items, 1):
+        parts.append(f"=== TRANSCRIPT {num} (id={item_id}) ===\n{transcript_text}")
+    return "\n\n".join(parts)
+
+
+def parse_content(content):
+    """Parse the model's (JSON mode) reply into a dict."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def write_data(data, output):
+    """Save extracted proposal data as JSON (UTF-8, 2-space indent)."""
+    if orjson is not None:
+        Path(output).write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+
+
+def schema_error(data):
+    """Return why data violates PROPOSAL_SCHEMA, or None if it's valid (or can't be checked)."""
+    if validate_proposal is None:
+        return None
+    try:
+        validate_proposal(data)
+    except fastjsonschema.JsonSchemaException as e:
+        return e.message
+    return None
+
+
+def reask_messages(content, error):
+    """Follow-up turn asking the model to fix a reply that failed the schema check."""
+    return [
+        {"role": "assistant", "content": content},
+        {"role": "user", "content": f"INVALID: {error}. Re-emit the complete JSON object, valid against the schema."}
+    ]
+
+
+def complete_streaming(client, request):
+    """
+    Run a chat completion with stream=True and return the full reply text.
+    Tokens are collected as they arrive instead of waiting for the whole
+    response body to be generated, buffered and decoded in one go.
+    """
+    parts = []
+    for chunk in client.chat.completions.create(**request, stream=True):
+        if chunk.choices and chunk.choices[0].delta.content:
+            parts.append(chunk.choices[0].delta.content)
+    return "".join(parts)
+
+
+def analyze_text(client, model, user_content):
+    """
+    One chat completion call; returns the parsed JSON reply.
+    A reply that fails the schema check gets one corrective re-ask.
+    """
+    request = build_request(model, user_content)
+    content = complete_streaming(client, request)
+    data = parse_content(content)
+    
+    error = schema_error(data)
+    if error:
+        print(f"[WARN] Reply failed schema check ({error}), asking for a corrected version")
+        request["messages"] += reask_messages(content, error)
+        data = parse_content(complete_streaming(client, request))
+        error = schema_error(data)
+        if error:
+            print(f"[WARN] Corrected reply still fails schema check: {error}")
+    return data
+
+
+async def analyze_text_async(aclient, model, user_content, sem, validate=True, objects=1):
+    """Async analyze_text; sem bounds the number of in-flight API calls."""
+    request = build_request(model, user_content, objects)
+    async with sem:
+        response = await aclient.chat.completions.create(**request)
+    content = response.choices[0].message.content
+    data = parse_content(content)
+    
+    error = schema_error(data) if validate else None
+    if error:
+        print(f"[WARN] Reply failed schema check ({error}), asking for a corrected version")
+        request["messages"] += reask_messages(content, error)
+        async with sem:
+            response = await aclient.chat.completions.create(**request)
+        data = parse_content(response.choices[0].message.content)
+        error = schema_error(data)
+        if error:
+            print(f"[WARN] Corrected reply still fails schema check: {error}")
+    return data
+
+
+async def analyze_group(aclient, model, items, sem):
+    """
+    Analyze a group of (id, transcript_text) in a single call.
+    Falls back to one call per transcript if the reply isn't a list of
+    the right length, and for any entry that fails the schema check.
+    Returns {id: data}.
+    """
+    analyzed = {}
+    if len(items) > 1:
+        try:
+            reply = await analyze_text_async(aclient, model, build_group_content(items), sem,
+                                             validate=False, objects=len(items))
+            results = reply.get("results")
+            if isinstance(results, list) and len(results) == len(items):
+                analyzed = {
+                    item_id: data for (item_id, _), data in zip(items, results)
+                    if schema_error(data) is None
+                }
+            else:
+                print(f"[WARN] Grouped reply had the wrong shape, retrying {len(items)} transcripts one by one")
+        except ValueError as e:
+            print(f"[WARN] Grouped reply was not valid JSON ({e}), retrying one by one")
+    
+    remaining = [(item_id, text) for item_id, text in items if item_id not in analyzed]
+    results = await asyncio.gather(*[
+        analyze_text_async(aclient, model, build_user_content(transcript_text), sem)
+        for _, transcript_text in remaining
+    ])
+    analyzed.update({item_id: data for (item_id, _), data in zip(remaining, results)})
+    return analyzed
+
+
+async def analyze_paths(aclient, model, group, sem):
+    """Analyze one group of transcript files and write their _data.json files. Returns failure count."""
+    # Read the group's files in parallel worker threads so disk I/O overlaps
+    # with API calls already in flight for other groups
+    texts = await asyncio.gather(*[asyncio.to_thread(read_text, path) for path in group])
+    items = [(path.stem, text) for path, text in zip(group, texts)]
+    # Size the model to the whole group when several transcripts share a prompt
+    model = resolve_model(model, "".join(texts))
+    try:
+        results = await analyze_group(aclient, model, items, sem)
+    except Exception as e:
+        print(f"[ERROR] Analysis failed for {', '.join(item_id for item_id, _ in items)}: {e}")
+        return len(group)
+    for path in group:
+        output = path.parent / f"{path.stem}_data.json"
+        # Keep disk writes off the event loop so other calls keep flowing
+        await asyncio.to_thread(write_data, results[path.stem], output)
+        print(f"[SUCCESS] {path.stem} -> {output}")
+    return 0
+
+
+async def run_dir_async(api_key, transcript_dir, model, group_size, concurrency):
+    transcript_paths = sorted(Path(transcript_dir).glob("*.txt"))
+    if not transcript_paths:
+        print(f"[ERROR] No .txt transcripts found in {transcript_dir}")
+        return 1
+    
+    group_size = max(1, min(group_size, MAX_GROUP_SIZE))
+    groups = [transcript_paths[i:i + group_size] for i in range(0, len(transcript_paths), group_size)]
+    print(f"Analyzing {len(transcript_paths)} transcripts with {model} "
+          f"({group_size} per call, up to {concurrency} calls at once)...")
+    
+    sem = asyncio.Semaphore(concurrency)
+    import openai
+
+    async with openai.AsyncOpenAI(api_key=api_key) as aclient:
+        failures = await asyncio.gather(*[analyze_paths(aclient, model, group, sem) for group in groups])
+    
+    return 1 if sum(failures) else 0
+
+
+def run_dir(api_key, transcript_dir, model, group_size, concurrency=DEFAULT_CONCURRENCY):
+    """
+    Analyze every *.txt transcript in transcript_dir live, group_size
+    transcripts per API call and up to `concurrency` calls in flight.
+    Writes {stem}_data.json next to each one.
+    """
+    return asyncio.run(run_dir_async(api_key, transcript_dir, model, group_size, concurrency))
+
+
+def run_batch(client, batch_dir, model):
+    """
+    Analyze every *.txt transcript in batch_dir through the OpenAI Batch API.
+    
+    All transcripts go up as one JSONL file and one batch job (half the price
+    of live calls, no per-request rate limiting). Results are written next to
+    the transcripts as {stem}_data.json. Meant for non-interactive runs: the
+    batch can take minutes to hours to complete.
+    """
+    transcript_paths = sorted(Path(batch_dir).glob("*.txt"))
+    if not transcript_paths:
+        print(f"[ERROR] No .txt transcripts found in {batch_dir}")
+        return 1
+    
+    user_contents = {path.stem: build_user_content(read_text(path)) for path in transcript_paths}
+    # A batch file may only target one model, so 'auto' is sized to the
+    # longest transcript
+    model = resolve_model(model, max(user_contents.values(), key=len))
+    
+    lines = [
+        json.dumps({
+            "custom_id": stem,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": build_request(model, user_content),
+        })
+        for stem, user_content in user_contents.items()
+    ]
+    
+    print(f"Submitting batch of {len(lines)} transcripts with {model}...")
+    batch_file = client.files.create(
+        file=("transcripts.jsonl", "\n".join(lines).encode('utf-8')),
+        purpose="batch"
+    )
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    print(f"Batch {batch.id} created, waiting for completion...")
+    
+    delay = BATCH_POLL_INITIAL
+    while batch.status not in BATCH_TERMINAL_STATES:
+        time.sleep(delay)
+        delay = min(delay * 2, BATCH_POLL_MAX)
+        batch = client.batches.retrieve(batch.id)
+        print(f"  status: {batch.status}")
+    
+    if batch.status != "completed" or not batch.output_file_id:
+        print(f"[ERROR] Batch {batch.id} ended with status '{batch.status}'")
+        return 1
+    
+    failures = 0
+    output_text = client.files.content(batch.output_file_id).text
+    for line in output_text.splitlines():
+        if not line.strip():
+            continue
+        result = json.loads(line)
+        stem = result["custom_id"]
+        response = result.get("response") or {}
+        try:
+            if result.get("error") or response.get("status_code") != 200:
+                raise RuntimeError(result.get("error") or response.get("body"))
+            content = response["body"]["choices"][0]["message"]["content"]
+            data = parse_content(content)
+            output = Path(batch_dir) / f"{stem}_data.json"
+            write_data(data, output)
+            print(f"[SUCCESS] {stem} -> {output}")
+            # No re-ask in batch mode; flag it so the file gets a manual look
+            error = schema_error(data)
+            if error:
+                print(f"[WARN] {stem}: reply fails schema check: {error}")
+        except Exception as e:
+            failures += 1
+            print(f"[ERROR] {stem}: {e}")
+    
+    if batch.error_file_id:
+        print(f"[WARN] Some requests failed; see batch error file {batch.error_file_id}")
+    
+    return 1 if failures else 0
+
+
+def run_via_daemon(transcript, model, output, additional_context, additional_context_path):
+    """
+    Run a single-transcript job on the warm daemon. Returns the exit code,
+    or None when no daemon is running (the caller then runs standalone).
+    """
+    import warm_worker
+
+    transcript_path = Path(transcript).resolve()
+    if additional_context_path:
+        additional_context = read_text(additional_context_path)
+    try:
+        reply = warm_worker.request({
+            "cmd": "analyze",
+            "transcript": str(transcript_path),
+            "output": str(Path(output).resolve()) if output else None,
+            "model": model,
+            "additional_context": additional_context,
+        })
+    except TimeoutError as e:
+        # The daemon may still finish the job; don't run it a second time
+        print(f"[ERROR] {e}")
+        return 1
+    if reply is None:
+        return None
+    if not reply.get("ok"):
+        print(f"[ERROR] Analysis failed: {reply.get('error')}")
+        return 1
+    print(f"[SUCCESS] Data extracted to: {reply['output']}")
+    print("Next Step: Run 'python execution/generate_proposal.py --client-data ...'")
+    return 0
+
 
 @click.command()
-@click.option('--transcript', required=True, type=click.Path(exists=True), help='Path to transcript text file')
-@click.option('--model', default='gpt-5-nano', help='OpenAI model to use')
+@click.option('--transcript', default=None, type=click.Path(exists=True), help='Path to transcript text file')
+@click.option('--batch-dir', default=None, type=click.Path(exists=True, file_okay=False), help='Analyze every .txt transcript in this directory via the OpenAI Batch API (offline, slower, cheaper)')
+@click.option('--dir', 'transcript_dir', default=None, type=click.Path(exists=True, file_okay=False), help='Analyze every .txt transcript in this directory (live API calls)')
+@click.option('--batch', 'group_size', default=1, type=click.IntRange(1, MAX_GROUP_SIZE), help=f'With --dir: transcripts per API call (max {MAX_GROUP_SIZE})')
+@click.option('--concurrency', default=DEFAULT_CONCURRENCY, type=click.IntRange(1, None), help='With --dir: max API calls in flight at once')
+@click.option('--model', default='gpt-5-nano', help="OpenAI model to use, or 'auto' to pick one by transcript length")
 @click.option('--output', default=None, help='Output JSON path')
 @click.option('--additional-context', default=None, help='Research findings about the client (e.g., online presence, website analysis, social media, industry insights)')
 @click.option('--additional-context-path', default=None, type=click.Path(exists=True), help='Path to a file containing research findings about the client')
-def main(transcript, model, output, additional_context, additional_context_path):
+def main(transcript, batch_dir, transcript_dir, group_size, concurrency, model, output, additional_context, additional_context_path):
     """Analyze transcript and generate proposal data JSON."""
     
+    if sum(bool(x) for x in (transcript, batch_dir, transcript_dir)) != 1:
+        print("[ERROR] Provide exactly one of --transcript, --dir or --batch-dir")
+        return 1
+    
+    if transcript and not batch_dir:
+        # Hand the job to a warm daemon (execution/warm_worker.py) if one is running
+        code = run_via_daemon(transcript, model, output, additional_context, additional_context_path)
+        if code is not None:
+            return code
+    
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         print("[ERROR] OPENAI_API_KEY not found in .env")
         return 1
 
+    if transcript_dir:
+        return run_dir(api_key, transcript_dir, model, group_size, concurrency)
+    
+    import openai
+
     client = openai.OpenAI(api_key=api_key)
     
+    if batch_dir:
+        try:
+            return run_batch(client, batch_dir, model)
+        except Exception as e:
+            print(f"[ERROR] Batch analysis failed: {e}")
+            return 1
+    
     transcript_path = Path(transcript)
     if not output:
         output = transcript_path.parent / f"{transcript_path.stem}_data.json"
         
     print(f"Reading transcript: {transcript_path}")
-    with open(transcript_path, 'r', encoding='utf-8') as f:
-        transcript_text = f.read()
+    transcript_text = read_text(transcript_path)
 
     additional_context_text = None
     if additional_context_path:
-        context_path = Path(additional_context_path)
-        with open(context_path, 'r', encoding='utf-8') as f:
-            additional_context_text = f.read()
+        additional_context_text = read_text(additional_context_path)
     elif additional_context:
         additional_context_text = additional_context
 
-    if additional_context_text:
-        user_content = (
-            "Here is the transcript:\n\n"
-            f"{transcript_text}\n\n"
-            "Additional context (use this to resolve factual details and preferences when the transcript is ambiguous; still follow the schema constraints):\n\n"
-            f"{additional_context_text}"
-        )
-    else:
-        user_content = f"Here is the transcript:\n\n{transcript_text}"
+    user_content = build_user_content(transcript_text, additional_context_text)
+    model = resolve_model(model, user_content)
 
     print(f"Analyzing with {model}...")
     
     try:
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": user_content}
-            ]
-        )
-        
-        content = response.choices[0].message.content.strip()
-        
-        # Clean markdown wrappers if present
-        if content.startswith("```json"):
-            content = content[7:]
-        if content.endswith("```"):
-            content = content[:-3]
-            
-        data = json.loads(content)
+        data = analyze_text(client, model, user_content)
         
         # Save JSON
-        with open(output, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
+        write_data(data, output)
             
         print(f"[SUCCESS] Data extracted to: {output}")
         print("Next Step: Run 'python execution/generate_proposal.py --client-data ...'")
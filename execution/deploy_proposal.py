@@ -1,18 +1,17 @@
 import os
-import sys
-import shutil
-import subprocess
-import time
-import random
+import gzip
+import json
+import base64
 from pathlib import Path
 import click
 from dotenv import load_dotenv
 
-# Add project root to path
-PROJECT_ROOT = Path(__file__).parent.parent
-sys.path.insert(0, str(PROJECT_ROOT))
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-load_dotenv()
+PROJECT_ROOT = Path(__file__).parent.parent
 
 
 def _get_env_int(name: str, default: int) -> int:
@@ -36,6 +35,81 @@ def _get_env_float(name: str, default: float) -> float:
         print(f"[WARN] Invalid {name}={raw!r}. Using default {default}.")
         return default
 
+# Relative hero image link left in proposals generated with --link-hero
+HERO_FILENAME = "hero_image.jpg"
+HERO_REF = f"url('./{HERO_FILENAME}')".encode("utf-8")
+
+
+def _file_entry(name: str, data: bytes) -> dict:
+    """
+    Vercel v13 inline file entry, sent as base64 of the raw bytes.
+    Costs +33% on the wire but skips a UTF-8 decode and the JSON string-escape
+    pass over the whole document. Files are stored and served verbatim, so
+    they can't be pre-gzipped here.
+    """
+    return {"file": name, "data": base64.b64encode(data).decode("ascii"), "encoding": "base64"}
+
+
+# Timeouts, rate limits and server errors are retried; anything else is final
+RETRY_STATUSES = frozenset({408, 429} | set(range(500, 600)))
+
+
+def _build_retry():
+    """
+    urllib3 retry policy for deploy requests: exponential backoff with jitter
+    (VERCEL_DEPLOY_BACKOFF_BASE * 2^n for retry n = 0, 1, 2, ...), honouring
+    Retry-After on 429/503.
+    """
+    import random
+    from itertools import takewhile
+    from urllib3.util.retry import Retry
+
+    class _DeployRetry(Retry):
+        # urllib3 2.x retries the first failure immediately (0s, 2s, 4s);
+        # wait backoff_factor before it too (1s, 2s, 4s)
+        def get_backoff_time(self) -> float:
+            failures = len(list(takewhile(lambda h: h.redirect_location is None, reversed(self.history))))
+            if failures == 0:
+                return 0.0
+            backoff = self.backoff_factor * (2 ** (failures - 1))
+            if self.backoff_jitter:
+                backoff += random.random() * self.backoff_jitter
+            return float(max(0.0, min(self.backoff_max, backoff)))
+
+    return _DeployRetry(
+        total=max(_get_env_int("VERCEL_DEPLOY_MAX_ATTEMPTS", 4) - 1, 0),
+        backoff_factor=_get_env_float("VERCEL_DEPLOY_BACKOFF_BASE", 1.0),
+        backoff_jitter=0.25,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods={"POST"},
+        respect_retry_after_header=True,
+        # Hand back the last response instead of raising, so its body gets reported
+        raise_on_status=False,
+    )
+
+
+# Shared keep-alive session so retries (and repeat deploys from one process)
+# reuse the TLS connection to api.vercel.com instead of handshaking again
+_SESSION = None
+
+
+def _get_session(token: str):
+    """Shared session for api.vercel.com with the auth headers set once."""
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        _SESSION = requests.Session()
+        # Single host, so one pool; a few connections for concurrent callers
+        _SESSION.mount("https://", HTTPAdapter(max_retries=_build_retry(), pool_connections=1, pool_maxsize=4))
+    _SESSION.headers.update({
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/json"
+    })
+    return _SESSION
+
+
 @click.command()
 @click.option('--proposal', required=True, type=click.Path(exists=True), help='Path to HTML proposal file')
 @click.option('--client-slug', default='proposal', help='Client name for project')
@@ -53,35 +127,27 @@ def main(proposal: str, client_slug: str):
     proposal_path = Path(proposal)
     
     # Read HTML content
-    with open(proposal_path, 'r', encoding='utf-8') as f:
-        html_content = f.read()
+    html_bytes = proposal_path.read_bytes()
+
+    files = [
+        _file_entry("index.html", html_bytes),
+        _file_entry("vercel.json", b'{"cleanUrls": true}'),
+    ]
+    # Proposals generated with --link-hero reference the hero image as a file
+    hero_path = proposal_path.parent / HERO_FILENAME
+    if HERO_REF in html_bytes and hero_path.exists():
+        files.append(_file_entry(HERO_FILENAME, hero_path.read_bytes()))
 
     # 2. Construct API Payload
     # Vercel API v13 allows direct file structure
     url = "https://api.vercel.com/v13/deployments"
-    
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    }
 
     payload = {
         "name": project_name,
         "public": True,
         "target": "production",
         "alias": [],
-        "files": [
-            {
-                "file": "index.html",
-                "data": html_content,
-                "encoding": "utf-8"
-            },
-            {
-                "file": "vercel.json",
-                "data": '{"cleanUrls": true}',
-                "encoding": "utf-8"
-            }
-        ],
+        "files": files,
         "projectSettings": {
             "framework": None
         }
@@ -114,47 +180,46 @@ def main(proposal: str, client_slug: str):
     
     try:
         import requests
+        session = _get_session(token)
         max_attempts = _get_env_int("VERCEL_DEPLOY_MAX_ATTEMPTS", 4)
         connect_timeout = _get_env_float("VERCEL_DEPLOY_CONNECT_TIMEOUT", 10.0)
         read_timeout = _get_env_float("VERCEL_DEPLOY_READ_TIMEOUT", 120.0)
         timeout = (connect_timeout, read_timeout)
-        backoff_base = _get_env_float("VERCEL_DEPLOY_BACKOFF_BASE", 1.0)
-
-        attempt = 1
-        response = None
-        last_error = None
-        while attempt <= max_attempts:
-            try:
-                response = requests.post(
+
+        # Serialize once up front; the session already sends Content-Type: application/json
+        if orjson is not None:
+            body = orjson.dumps(payload)
+        else:
+            body = json.dumps(payload).encode("utf-8")
+
+        # HTML/JSON compresses several-fold, but Vercel doesn't document gzip request
+        # bodies; opt in with VERCEL_DEPLOY_GZIP=1
+        use_gzip = os.environ.get("VERCEL_DEPLOY_GZIP", "0") == "1"
+
+        # Retries and backoff happen inside the session's adapter (_build_retry)
+        try:
+            if use_gzip:
+                response = session.post(
                     url,
                     params=params if params else None,
-                    json=payload,
-                    headers=headers,
+                    data=gzip.compress(body, compresslevel=6),
+                    headers={"Content-Encoding": "gzip"},
                     timeout=timeout,
                 )
-                if response.status_code == 200:
-                    last_error = None
-                    break
-
-                if response.status_code not in (408, 429) and not (500 <= response.status_code <= 599):
-                    print(f"[FAIL] API Error {response.status_code}: {response.text}")
-                    return 1
-
-                last_error = f"HTTP {response.status_code}: {response.text}"
-            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
-                last_error = str(e)
-
-            if attempt >= max_attempts:
-                break
-
-            sleep_s = backoff_base * (2 ** (attempt - 1)) + random.uniform(0, 0.25)
-            print(f"[WARN] Deploy attempt {attempt} failed ({last_error}). Retrying in {sleep_s:.2f}s...")
-            time.sleep(sleep_s)
-            attempt += 1
+            if not use_gzip or response.status_code == 415:
+                # Compressed body rejected as unsupported: fall back to the plain one
+                response = session.post(
+                    url,
+                    params=params if params else None,
+                    data=body,
+                    timeout=timeout,
+                )
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            print(f"[FAIL] Deployment request failed after {max_attempts} attempts: {e}")
+            return 1
 
-        if last_error:
-            status_part = f" (status={response.status_code})" if response is not None else ""
-            print(f"[FAIL] Deployment request failed after {max_attempts} attempts{status_part}: {last_error}")
+        if response.status_code != 200:
+            print(f"[FAIL] API Error {response.status_code}: {response.text}")
             return 1
         
         data = response.json()
@@ -191,4 +256,6 @@ def main(proposal: str, client_slug: str):
     return 0
 
 if __name__ == '__main__':
+    # Only the CLI reads .env; importers bring their own environment
+    load_dotenv()
     main()
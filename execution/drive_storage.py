@@ -20,8 +20,8 @@ Usage:
     # Upload a file
     python execution/drive_storage.py --action upload --file .tmp/proposals/acme.html
     
-    # Sync all local files to Drive
-    python execution/drive_storage.py --action sync
+    # Sync all local files to Drive (--verbose shows each file)
+    python execution/drive_storage.py --action sync --verbose
     
     # List files in Drive
     python execution/drive_storage.py --action list
@@ -33,18 +33,21 @@ Usage:
 import os
 import sys
 import json
+import time
+import logging
+import tempfile
+import threading
 import click
 from pathlib import Path
 from datetime import datetime
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional, Dict, List, Any
 
 from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload, MediaIoBaseDownload
 from googleapiclient.errors import HttpError
-import io
 
 # Add project root to path
 PROJECT_ROOT = Path(__file__).parent.parent
@@ -59,14 +62,12 @@ SCOPES = [
     'https://www.googleapis.com/auth/gmail.send',
 ]
 
+# Per-file progress goes through logging (shown with --verbose)
+logger = logging.getLogger("drive_storage")
+
 # Use auth_helper to get correct paths (handles Vercel /tmp)
-try:
-    import auth_helper
-    CREDENTIALS_FILE, TOKEN_FILE = auth_helper.restore_credentials()
-except ImportError:
-    # Fallback for local dev if auth_helper not found in path
-    CREDENTIALS_FILE = PROJECT_ROOT / 'credentials.json'
-    TOKEN_FILE = PROJECT_ROOT / 'token.json'
+import auth_helper
+CREDENTIALS_FILE, TOKEN_FILE = auth_helper.credential_paths()
 
 # Local directories to sync
 # On Vercel, we must write to /tmp
@@ -77,7 +78,6 @@ else:
 
 TRANSCRIPTS_DIR = TMP_DIR / 'transcripts'
 PROPOSALS_DIR = TMP_DIR / 'proposals'
-DEPLOY_DIR = TMP_DIR / 'deploy'
 
 # Drive folder structure
 DRIVE_ROOT_FOLDER = "InstantProd Proposals"
@@ -88,20 +88,96 @@ DRIVE_FOLDERS = {
     "exports": "exports",
 }
 
+FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+
+# Upload MIME types by file extension
+_MIME_TYPES = {
+    '.html': 'text/html',
+    '.txt': 'text/plain',
+    '.json': 'application/json',
+    '.md': 'text/markdown',
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.pdf': 'application/pdf',
+    '.zip': 'application/zip',
+}
+
+# Folder IDs persist between runs so warm CLI calls skip the folder lookups
+FOLDER_CACHE_FILE = TMP_DIR / '.drive_folder_cache.json'
+FOLDER_CACHE_TTL = 24 * 60 * 60  # seconds
+
+
+def _load_folder_cache() -> Dict[str, str]:
+    """Read the persisted folder IDs, or {} if missing, stale or unreadable."""
+    try:
+        if time.time() - FOLDER_CACHE_FILE.stat().st_mtime < FOLDER_CACHE_TTL:
+            return json.loads(FOLDER_CACHE_FILE.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        pass
+    return {}
+
+
+def _save_folder_cache():
+    """Atomically write the folder IDs back (caller holds _folder_cache_lock)."""
+    tmp_path = None
+    try:
+        FOLDER_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        # Unique temp name: concurrent CLI runs may save at the same time
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=FOLDER_CACHE_FILE.parent,
+                                         suffix='.tmp', delete=False) as tmp:
+            tmp_path = tmp.name
+            json.dump(_folder_cache, tmp)
+        os.replace(tmp_path, FOLDER_CACHE_FILE)
+    except OSError:
+        # Only an optimization; next run just looks the folders up again
+        if tmp_path:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+
+def _forget_folders(root_id: str):
+    """Drop the cached root folder ID and its subfolders' (caller holds _folder_cache_lock)."""
+    for key in [key for key, folder_id in _folder_cache.items()
+                if folder_id == root_id or key.startswith(f"{root_id}:")]:
+        del _folder_cache[key]
+
+
 # Cache for folder IDs
-_folder_cache: Dict[str, str] = {}
+_folder_cache: Dict[str, str] = _load_folder_cache()
+_folder_cache_lock = threading.Lock()
 
+# Retries (with exponential backoff) for 429 / 5xx responses
+API_RETRIES = 5
+# Resumable upload / download chunk size; big chunks keep large uploads from stalling on tiny writes
+MEDIA_CHUNK_SIZE = 16 * 1024 * 1024
+# Smaller files go up as a single multipart request instead of the
+# multi-request resumable protocol
+RESUMABLE_THRESHOLD = 5 * 1024 * 1024
+# Parallel uploads in sync_directory; kept low for Drive's per-user write quota
+DRIVE_SYNC_CONCURRENCY = max(1, int(os.getenv("DRIVE_SYNC_CONCURRENCY", "4")))
 
-def get_drive_service():
-    """Get authenticated Google Drive service."""
-    creds = None
+# Credentials and Drive service, built once per process
+_CREDENTIALS = None
+_SERVICE = None
+
+# Per-thread Drive services for parallel uploads (the client's http isn't thread-safe)
+_thread_local = threading.local()
+
+
+def get_credentials():
+    """Load (refreshing or re-authorizing as needed) the Google user credentials."""
+    global _CREDENTIALS
+    if _CREDENTIALS is not None and _CREDENTIALS.valid:
+        return _CREDENTIALS
     
-    if TOKEN_FILE.exists():
-        try:
-            creds = Credentials.from_authorized_user_file(str(TOKEN_FILE), SCOPES)
-        except Exception:
-            # Token file exists but may have different scopes, will re-auth
-            creds = None
+    try:
+        creds = auth_helper.load_user_credentials(TOKEN_FILE, SCOPES)
+    except Exception:
+        # Token exists but may have different scopes, will re-auth
+        creds = None
     
     if not creds or not creds.valid:
         if creds and creds.expired and creds.refresh_token:
@@ -112,15 +188,13 @@ def get_drive_service():
                 creds = None
         
         if not creds:
-            if not CREDENTIALS_FILE.exists():
+            if not CREDENTIALS_FILE.exists() and not auth_helper.get_credentials_info():
                 raise FileNotFoundError("credentials.json not found. Please set up Google API credentials.")
             
             print("🔐 Opening browser for Google authentication...")
             print("   (You may need to click 'Advanced' → 'Go to app' if you see a warning)")
             
-            flow = InstalledAppFlow.from_client_secrets_file(
-                str(CREDENTIALS_FILE), SCOPES
-            )
+            flow = auth_helper.get_client_flow(CREDENTIALS_FILE, SCOPES)
             creds = flow.run_local_server(port=0, access_type='offline', prompt='consent')
         
         # Save credentials for next time
@@ -128,77 +202,144 @@ def get_drive_service():
             token.write(creds.to_json())
         print("✅ Authentication successful!")
     
-    return build('drive', 'v3', credentials=creds)
+    _CREDENTIALS = creds
+    return creds
+
+
+def get_drive_service():
+    """
+    Get the authenticated Google Drive service (shared per process).
+    Built from the discovery document bundled with the client library, so
+    no discovery fetch over the network.
+    """
+    global _SERVICE
+    if _SERVICE is None:
+        _SERVICE = build('drive', 'v3', credentials=get_credentials(),
+                         cache_discovery=False, static_discovery=True)
+    return _SERVICE
+
+
+def _worker_service(creds):
+    """Drive service owned by the calling thread, built on first use."""
+    service = getattr(_thread_local, 'service', None)
+    if service is None:
+        service = build('drive', 'v3', credentials=creds, cache_discovery=False, static_discovery=True)
+        _thread_local.service = service
+    return service
+
+
+def _q(value: str) -> str:
+    """Escape a string for use inside a quoted Drive query literal."""
+    return value.replace("\\", "\\\\").replace("'", "\\'")
+
+
+def create_folder(service, folder_name: str, parent_id: str = None) -> str:
+    """Create a folder in Google Drive. Returns folder ID."""
+    file_metadata = {
+        'name': folder_name,
+        'mimeType': FOLDER_MIME_TYPE
+    }
+    if parent_id:
+        file_metadata['parents'] = [parent_id]
+    
+    folder = service.files().create(body=file_metadata, fields='id').execute(num_retries=API_RETRIES)
+    logger.info(f"  📁 Created folder: {folder_name}")
+    return folder.get('id')
 
 
 def get_or_create_folder(service, folder_name: str, parent_id: str = None) -> str:
     """Get or create a folder in Google Drive. Returns folder ID."""
     cache_key = f"{parent_id or 'root'}:{folder_name}"
     
-    if cache_key in _folder_cache:
-        return _folder_cache[cache_key]
+    with _folder_cache_lock:
+        if cache_key in _folder_cache:
+            return _folder_cache[cache_key]
     
     # Search for existing folder
-    query = f"name = '{folder_name}' and mimeType = 'application/vnd.google-apps.folder' and trashed = false"
+    query = f"name = '{_q(folder_name)}' and mimeType = '{FOLDER_MIME_TYPE}' and trashed = false"
     if parent_id:
         query += f" and '{parent_id}' in parents"
     
-    results = service.files().list(q=query, spaces='drive', fields='files(id, name)').execute()
+    results = service.files().list(q=query, spaces='drive', fields='files(id, name)').execute(num_retries=API_RETRIES)
     files = results.get('files', [])
     
-    if files:
-        folder_id = files[0]['id']
-    else:
-        # Create new folder
-        file_metadata = {
-            'name': folder_name,
-            'mimeType': 'application/vnd.google-apps.folder'
-        }
-        if parent_id:
-            file_metadata['parents'] = [parent_id]
-        
-        folder = service.files().create(body=file_metadata, fields='id').execute()
-        folder_id = folder.get('id')
-        print(f"  📁 Created folder: {folder_name}")
+    folder_id = files[0]['id'] if files else create_folder(service, folder_name, parent_id)
     
-    _folder_cache[cache_key] = folder_id
+    with _folder_cache_lock:
+        # Another thread may have resolved it meanwhile; keep the first ID
+        folder_id = _folder_cache.setdefault(cache_key, folder_id)
+        _save_folder_cache()
     return folder_id
 
 
+def _list_child_folders(service, parent_id: str) -> Optional[Dict[str, str]]:
+    """Map name -> ID of the live folders directly inside parent_id, or None if it no longer exists."""
+    try:
+        results = service.files().list(
+            q=f"'{parent_id}' in parents and mimeType = '{FOLDER_MIME_TYPE}' and trashed = false",
+            spaces='drive',
+            fields='files(id, name)',
+            pageSize=1000
+        ).execute(num_retries=API_RETRIES)
+    except HttpError as e:
+        if e.resp.status == 404:
+            return None
+        raise
+    found: Dict[str, str] = {}
+    for f in results.get('files', []):
+        found.setdefault(f['name'], f['id'])
+    return found
+
+
 def ensure_folder_structure(service) -> Dict[str, str]:
     """Ensure the folder structure exists in Google Drive. Returns folder IDs."""
-    print("📂 Ensuring folder structure in Google Drive...")
+    logger.info("📂 Ensuring folder structure in Google Drive...")
     
     # Create or get root folder
     root_id = get_or_create_folder(service, DRIVE_ROOT_FOLDER)
+    with _folder_cache_lock:
+        cached = {name: _folder_cache.get(f"{root_id}:{name}") for name in DRIVE_FOLDERS.values()}
+    
+    # Resolve every subfolder from one listing of the root folder. The
+    # listing also checks the cached IDs: one missing from it means that
+    # folder (or the root, taking its children along) was deleted or trashed.
+    found = _list_child_folders(service, root_id)
+    if found is None or any(folder_id and folder_id not in found.values() for folder_id in cached.values()):
+        logger.info("  Cached folder IDs are stale; looking the folders up again")
+        with _folder_cache_lock:
+            _forget_folders(root_id)
+            _save_folder_cache()
+        root_id = get_or_create_folder(service, DRIVE_ROOT_FOLDER)
+        found = _list_child_folders(service, root_id) or {}
+        cached = dict.fromkeys(DRIVE_FOLDERS.values())
+    
+    # Create only the subfolders that are genuinely missing
     folder_ids = {"root": root_id}
-    
-    # Create subfolders
     for key, name in DRIVE_FOLDERS.items():
-        folder_ids[key] = get_or_create_folder(service, name, root_id)
+        folder_id = cached[name] or found.get(name) or create_folder(service, name, root_id)
+        with _folder_cache_lock:
+            folder_ids[key] = _folder_cache.setdefault(f"{root_id}:{name}", folder_id)
     
-    print(f"  ✅ Folder structure ready!")
+    if not all(cached.values()):
+        with _folder_cache_lock:
+            _save_folder_cache()
+    
+    logger.info("  ✅ Folder structure ready!")
     return folder_ids
 
 
+@lru_cache(maxsize=None)
+def _mime_for_suffix(suffix: str) -> str:
+    return _MIME_TYPES.get(suffix, 'application/octet-stream')
+
+
 def get_mime_type(file_path: Path) -> str:
     """Get MIME type for a file."""
-    extension = file_path.suffix.lower()
-    mime_types = {
-        '.html': 'text/html',
-        '.txt': 'text/plain',
-        '.json': 'application/json',
-        '.md': 'text/markdown',
-        '.png': 'image/png',
-        '.jpg': 'image/jpeg',
-        '.jpeg': 'image/jpeg',
-        '.pdf': 'application/pdf',
-        '.zip': 'application/zip',
-    }
-    return mime_types.get(extension, 'application/octet-stream')
+    return _mime_for_suffix(file_path.suffix.lower())
 
 
-def upload_file(service, local_path: Path, folder_id: str, update_existing: bool = True) -> Dict[str, Any]:
+def upload_file(service, local_path: Path, folder_id: str, update_existing: bool = True,
+                existing_files: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
     """
     Upload a file to Google Drive.
     
@@ -207,6 +348,8 @@ def upload_file(service, local_path: Path, folder_id: str, update_existing: bool
         local_path: Path to local file
         folder_id: ID of target folder in Drive
         update_existing: If True, update existing file instead of creating duplicate
+        existing_files: Files already in the folder under this name (see
+            existing_by_name); if None, Drive is queried for the file name
         
     Returns:
         Dict with file info (id, name, webViewLink)
@@ -218,11 +361,13 @@ def upload_file(service, local_path: Path, folder_id: str, update_existing: bool
     mime_type = get_mime_type(local_path)
     
     # Check if file already exists
-    query = f"name = '{file_name}' and '{folder_id}' in parents and trashed = false"
-    results = service.files().list(q=query, spaces='drive', fields='files(id, name)').execute()
-    existing_files = results.get('files', [])
+    if existing_files is None:
+        query = f"name = '{_q(file_name)}' and '{folder_id}' in parents and trashed = false"
+        results = service.files().list(q=query, spaces='drive', fields='files(id, name)').execute(num_retries=API_RETRIES)
+        existing_files = results.get('files', [])
     
-    media = MediaFileUpload(str(local_path), mimetype=mime_type, resumable=True)
+    resumable = local_path.stat().st_size > RESUMABLE_THRESHOLD
+    media = MediaFileUpload(str(local_path), mimetype=mime_type, resumable=resumable, chunksize=MEDIA_CHUNK_SIZE)
     
     if existing_files and update_existing:
         # Update existing file
@@ -231,7 +376,7 @@ def upload_file(service, local_path: Path, folder_id: str, update_existing: bool
             fileId=file_id,
             media_body=media,
             fields='id, name, webViewLink, modifiedTime'
-        ).execute()
+        ).execute(num_retries=API_RETRIES)
         action = "Updated"
     else:
         # Create new file
@@ -243,51 +388,62 @@ def upload_file(service, local_path: Path, folder_id: str, update_existing: bool
             body=file_metadata,
             media_body=media,
             fields='id, name, webViewLink, modifiedTime'
-        ).execute()
+        ).execute(num_retries=API_RETRIES)
         action = "Uploaded"
     
-    print(f"  ☁️  {action}: {file_name}")
+    logger.info(f"  ☁️  {action}: {file_name}")
     return file
 
 
 def download_file(service, file_id: str, output_path: Path) -> Path:
-    """Download a file from Google Drive."""
+    """Download a file from Google Drive, streaming it straight to disk."""
     request = service.files().get_media(fileId=file_id)
     
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    fh = io.BytesIO()
-    downloader = MediaIoBaseDownload(fh, request)
+    with open(output_path, 'wb') as fh:
+        downloader = MediaIoBaseDownload(fh, request, chunksize=MEDIA_CHUNK_SIZE)
+        done = False
+        while not done:
+            status, done = downloader.next_chunk(num_retries=API_RETRIES)
     
-    done = False
-    while not done:
-        status, done = downloader.next_chunk()
-    
-    with open(output_path, 'wb') as f:
-        fh.seek(0)
-        f.write(fh.read())
-    
-    print(f"  ⬇️  Downloaded: {output_path.name}")
+    logger.info(f"  ⬇️  Downloaded: {output_path.name}")
     return output_path
 
 
 def list_files_in_folder(service, folder_id: str, file_type: str = None) -> List[Dict[str, Any]]:
-    """List files in a Drive folder."""
+    """List files in a Drive folder (all pages)."""
     query = f"'{folder_id}' in parents and trashed = false"
     if file_type:
         query += f" and mimeType = '{file_type}'"
     
-    results = service.files().list(
-        q=query,
-        spaces='drive',
-        fields='files(id, name, mimeType, size, modifiedTime, webViewLink)',
-        orderBy='modifiedTime desc'
-    ).execute()
-    
-    return results.get('files', [])
-
-
-def sync_directory(service, local_dir: Path, folder_id: str, extensions: List[str] = None) -> int:
+    files = []
+    page_token = None
+    while True:
+        results = service.files().list(
+            q=query,
+            spaces='drive',
+            fields='nextPageToken, files(id, name, mimeType, size, modifiedTime, webViewLink)',
+            orderBy='modifiedTime desc',
+            pageSize=1000,
+            pageToken=page_token
+        ).execute(num_retries=API_RETRIES)
+        files.extend(results.get('files', []))
+        page_token = results.get('nextPageToken')
+        if not page_token:
+            return files
+
+
+def existing_by_name(service, folder_id: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Map file name -> files with that name in a Drive folder (newest first)."""
+    existing: Dict[str, List[Dict[str, Any]]] = {}
+    for f in list_files_in_folder(service, folder_id):
+        existing.setdefault(f['name'], []).append(f)
+    return existing
+
+
+def sync_directory(service, local_dir: Path, folder_id: str, extensions: List[str] = None,
+                   existing: Optional[Dict[str, List[Dict[str, Any]]]] = None) -> int:
     """
     Sync a local directory to a Drive folder.
     
@@ -296,6 +452,7 @@ def sync_directory(service, local_dir: Path, folder_id: str, extensions: List[st
         local_dir: Local directory path
         folder_id: Target Drive folder ID
         extensions: List of file extensions to sync (e.g., ['.html', '.txt'])
+        existing: Folder contents from existing_by_name; listed here if None
         
     Returns:
         Number of files synced
@@ -303,16 +460,36 @@ def sync_directory(service, local_dir: Path, folder_id: str, extensions: List[st
     if not local_dir.exists():
         return 0
     
+    # scandir's entries carry the file type, so no stat() per file
+    with os.scandir(local_dir) as entries:
+        file_paths = [
+            Path(entry.path) for entry in entries
+            if entry.is_file() and (not extensions or os.path.splitext(entry.name)[1].lower() in extensions)
+        ]
+    if not file_paths:
+        return 0
+    
+    # One listing of the folder replaces a "does it exist?" query per file
+    if existing is None:
+        existing = existing_by_name(service, folder_id)
+    
+    # Uploads are I/O-bound, so overlap them on a small pool; each worker
+    # thread gets its own service since the client's http isn't thread-safe.
+    creds = get_credentials()
+    
+    def _upload(file_path: Path):
+        return upload_file(_worker_service(creds), file_path, folder_id,
+                           existing_files=existing.get(file_path.name, []))
+    
     count = 0
-    for file_path in local_dir.iterdir():
-        if file_path.is_file():
-            if extensions and file_path.suffix.lower() not in extensions:
-                continue
+    with ThreadPoolExecutor(max_workers=min(DRIVE_SYNC_CONCURRENCY, len(file_paths))) as executor:
+        futures = {executor.submit(_upload, file_path): file_path for file_path in file_paths}
+        for future in as_completed(futures):
             try:
-                upload_file(service, file_path, folder_id)
+                future.result()
                 count += 1
             except Exception as e:
-                print(f"  ⚠️  Failed to upload {file_path.name}: {e}")
+                logger.warning(f"  ⚠️  Failed to upload {futures[future].name}: {e}")
     
     return count
 
@@ -331,21 +508,21 @@ def sync_all(service = None) -> Dict[str, int]:
     results = {}
     
     # Sync transcripts
-    print("\n📄 Syncing transcripts...")
+    logger.info("\n📄 Syncing transcripts...")
     results['transcripts'] = sync_directory(
         service, TRANSCRIPTS_DIR, folder_ids['transcripts'],
         extensions=['.txt', '.json']
     )
     
     # Sync proposals
-    print("\n📑 Syncing proposals...")
+    logger.info("\n📑 Syncing proposals...")
     results['proposals'] = sync_directory(
         service, PROPOSALS_DIR, folder_ids['proposals'],
         extensions=['.html']
     )
     
     # Sync deployment info
-    print("\n🚀 Syncing deployment data...")
+    logger.info("\n🚀 Syncing deployment data...")
     last_url_file = TMP_DIR / 'last_deployment_url.txt'
     if last_url_file.exists():
         upload_file(service, last_url_file, folder_ids['deployments'])
@@ -388,8 +565,14 @@ def upload_single_file(file_path: Path, folder_type: str = "proposals") -> Dict[
               default='proposals', help='Target folder in Drive')
 @click.option('--file-id', help='Google Drive file ID for download')
 @click.option('--output', type=click.Path(), help='Output path for download')
-def main(action: str, file_path: Optional[str], folder: str, file_id: Optional[str], output: Optional[str]):
+@click.option('--verbose', is_flag=True, help='Show per-file progress')
+def main(action: str, file_path: Optional[str], folder: str, file_id: Optional[str], output: Optional[str],
+         verbose: bool):
     """Google Drive storage manager for InstantProd proposals."""
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO if verbose else logging.WARNING)
     
     try:
         service = get_drive_service()
@@ -436,12 +619,11 @@ def main(action: str, file_path: Optional[str], folder: str, file_id: Optional[s
             # If file_id looks like a filename, try to find it
             if file_id and '.' in file_id:
                  print(f"Searching for file '{file_id}' in Drive...")
-                 found_files = []
-                 # Search in all known folders
-                 for f_id in folder_ids.values():
-                     q = f"'{f_id}' in parents and name = '{file_id}' and trashed = false"
-                     res = service.files().list(q=q, fields="files(id, name)").execute()
-                     found_files.extend(res.get('files', []))
+                 # Search all known folders in one query
+                 parents_clause = " or ".join(f"'{f_id}' in parents" for f_id in folder_ids.values())
+                 q = f"name = '{_q(file_id)}' and trashed = false and ({parents_clause})"
+                 res = service.files().list(q=q, fields="files(id, name, parents)").execute(num_retries=API_RETRIES)
+                 found_files = res.get('files', [])
                  
                  if found_files:
                      target_id = found_files[0]['id']
@@ -9,16 +9,29 @@ and outputs a customized proposal ready for delivery.
 import os
 import sys
 import json
-import base64
-import html
+import hashlib
 import re
+import shutil
 from pathlib import Path
-from datetime import datetime
+from datetime import date
+from functools import lru_cache
+from itertools import islice
 from typing import Dict, Any, Optional
 
 import click
 from dotenv import load_dotenv
 
+try:
+    # SIMD base64; same API as the stdlib module
+    import pybase64 as b64
+except ImportError:
+    import base64 as b64
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
@@ -30,11 +43,32 @@ LOGO_FILE = PROJECT_ROOT / 'Dark-mode.svg'
 TMP_DIR = PROJECT_ROOT / '.tmp'
 PROPOSALS_DIR = TMP_DIR / 'proposals'
 
+# Precompiled patterns
+_BR_RE = re.compile(r'<br\s*/?>')
+_LEAD_NUM_RE = re.compile(r'^\d+[).\-\s]*')
+# Template placeholders ({{HERO_DATA_URI}} included)
+_RENDER_RE = re.compile(r'\{\{([A-Z_0-9]+)\}\}')
+HERO_FILENAME = 'hero_image.jpg'
+
+
+_IMAGE_MIME_TYPES = {
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.gif': 'image/gif',
+    '.svg': 'image/svg+xml',
+    '.webp': 'image/webp',
+}
+
 
 def encode_image_to_data_uri(image_path: Path) -> str:
     """
     Encode an image file to a base64 data URI.
     
+    Encodings are cached in memory by content hash, so identical images
+    (even under other names or with new mtimes) are only base64-encoded
+    once per process.
+    
     Args:
         image_path: Path to the image file
         
@@ -44,38 +78,127 @@ def encode_image_to_data_uri(image_path: Path) -> str:
     if not image_path.exists():
         raise FileNotFoundError(f"Image not found: {image_path}")
     
-    # Determine MIME type
-    suffix = image_path.suffix.lower()
-    mime_types = {
-        '.png': 'image/png',
-        '.jpg': 'image/jpeg',
-        '.jpeg': 'image/jpeg',
-        '.gif': 'image/gif',
-        '.svg': 'image/svg+xml',
-        '.webp': 'image/webp',
-    }
-    
-    mime_type = mime_types.get(suffix, 'image/png')
-    
-    # Read and encode
-    with open(image_path, 'rb') as f:
-        image_data = f.read()
-    
-    base64_data = base64.b64encode(image_data).decode('utf-8')
-    return f"data:{mime_type};base64,{base64_data}"
+    stat = image_path.stat()
+    return _cached_data_uri(str(image_path), stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=8)
+def _cached_data_uri(path: str, mtime_ns: int, size: int) -> str:
+    # Fast path for repeat calls in one process; the real cache key is the content
+    image_path = Path(path)
+    mime_type = _IMAGE_MIME_TYPES.get(image_path.suffix.lower(), 'image/png')
+    return f"data:{mime_type};base64,{_encode_base64(image_path.read_bytes())}"
+
+
+# blake2b digest of the bytes -> base64 text
+_BASE64_BY_DIGEST: Dict[str, str] = {}
+
+
+def _encode_base64(data: bytes) -> str:
+    digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+    encoded = _BASE64_BY_DIGEST.get(digest)
+    if encoded is not None:
+        return encoded
+    
+    encoded = b64.b64encode(data).decode('ascii')
+    _BASE64_BY_DIGEST[digest] = encoded
+    return encoded
+
+
+def compile_template(template_path: Path) -> tuple:
+    """
+    Parse a template into alternating parts: literal, key, literal, ..., literal.
+    Cached until the template changes on disk.
+    """
+    stat = template_path.stat()
+    return _compiled_template(str(template_path), stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=4)
+def _compiled_template(path: str, mtime_ns: int, size: int) -> tuple:
+    with open(path, 'r', encoding='utf-8') as f:
+        return tuple(_RENDER_RE.split(f.read()))
+
+
+# format -> (date, formatted string) for today's date
+_today_cache: Dict[str, tuple] = {}
+
+
+def today_str(fmt: str) -> str:
+    """Today's date formatted with fmt; formatted once per day per format."""
+    today = date.today()
+    cached = _today_cache.get(fmt)
+    if cached is None or cached[0] != today:
+        cached = _today_cache[fmt] = (today, today.strftime(fmt))
+    return cached[1]
 
 
 def load_client_data(json_path: Path) -> Dict[str, Any]:
     """Load client data from a JSON file."""
+    if orjson is not None:
+        return orjson.loads(json_path.read_bytes())
     with open(json_path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
 
+# Same output as html.escape(quote=True), in one C-level pass per string
+_HTML_ESCAPE_TABLE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#x27;',
+})
+
+
+class CharMap(dict):
+    """str.translate table that works out each character's mapping on first use."""
+    def __init__(self, rule):
+        super().__init__()
+        self.rule = rule
+
+    def __missing__(self, code):
+        value = self[code] = self.rule(chr(code))
+        return value
+
+
+# Filename-safe client names: word characters and '-' kept, anything else -> '_'
+_SAFE_NAME_TABLE = CharMap(lambda c: c if c.isalnum() or c in '_-' else '_')
+
+
 def escape_html(text: str) -> str:
     """Escape HTML special characters in text."""
     if not text:
         return ""
-    return html.escape(str(text))
+    return str(text).translate(_HTML_ESCAPE_TABLE)
+
+
+# (placeholder, data key, default) for fields that are just escaped text
+_TEXT_FIELDS = (
+    ('COMPANY', 'company', 'InstantProd'),
+    ('CLIENT_NAME', 'client_name', 'Client'),
+    ('WEBSITE', 'website', ''),
+    ('PREPARED_BY', 'prepared_by', 'InstantProd'),
+    ('PROBLEM', 'problem', ''),
+    ('PROBLEM_POINT_1', 'problem_point_1', ''),
+    ('PROBLEM_POINT_2', 'problem_point_2', ''),
+    ('PROBLEM_POINT_3', 'problem_point_3', ''),
+    ('PROBLEM_POINT_4', 'problem_point_4', ''),
+    ('SOLUTION', 'solution', ''),
+    ('TIMELINE', 'timeline', ''),
+    ('MIN_TERM_LABEL', 'min_term_label', 'Minimum Term'),
+    ('MIN_TERM_VALUE', 'min_term_value', ''),
+    ('SIGNATURE_INSTRUCTION', 'signature_instruction', 'Please sign below to accept this proposal.'),
+)
+
+
+# Investment option (as written by the analysis step) -> (plan label, price)
+_PLAN_DETAILS = {
+    "Starter subscription - flat monthly plan": ("Starter", "JMD 85,000 / month"),
+    "Growth subscription - flat monthly plan": ("Growth", "JMD 240,000 / month"),
+    "Strategic Partner subscription - flat monthly plan": ("Strategic Partner", "JMD 650,000 / month"),
+    "Flat monthly subscription - plan to be confirmed": ("Flat monthly subscription - plan to be confirmed", ""),
+}
 
 
 def build_placeholder_map(data: Dict[str, Any], logo_path: Optional[Path] = None) -> Dict[str, str]:
@@ -89,14 +212,14 @@ def build_placeholder_map(data: Dict[str, Any], logo_path: Optional[Path] = None
     Returns:
         Dictionary mapping placeholder names to values
     """
-    placeholders = {}
+    # Plain text fields
+    placeholders = {
+        key: escape_html(data.get(field, default))
+        for key, field, default in _TEXT_FIELDS
+    }
     
-    # Header fields
-    placeholders['COMPANY'] = escape_html(data.get('company', 'InstantProd'))
-    placeholders['CLIENT_NAME'] = escape_html(data.get('client_name', 'Client'))
-    placeholders['WEBSITE'] = escape_html(data.get('website', ''))
-    placeholders['PREPARED_BY'] = escape_html(data.get('prepared_by', 'InstantProd'))
-    placeholders['DATE'] = escape_html(data.get('date', datetime.now().strftime('%B %d, %Y')))
+    # Date (default depends on the day, so it can't live in the table)
+    placeholders['DATE'] = escape_html(data['date'] if 'date' in data else today_str('%B %d, %Y'))
     
     # Logo
     if logo_path and logo_path.exists():
@@ -135,30 +258,24 @@ def build_placeholder_map(data: Dict[str, Any], logo_path: Optional[Path] = None
 
     placeholders['GOALS_HTML'] = "".join(goal_items)
 
-    # Problem section
-    placeholders['PROBLEM'] = escape_html(data.get('problem', ''))
-    placeholders['PROBLEM_POINT_1'] = escape_html(data.get('problem_point_1', ''))
-    placeholders['PROBLEM_POINT_2'] = escape_html(data.get('problem_point_2', ''))
-    placeholders['PROBLEM_POINT_3'] = escape_html(data.get('problem_point_3', ''))
-    placeholders['PROBLEM_POINT_4'] = escape_html(data.get('problem_point_4', ''))
-    
     # Solution section
-    placeholders['SOLUTION'] = escape_html(data.get('solution', ''))
     deliverables_raw = str(data.get('deliverables', ''))
     placeholders['DELIVERABLES'] = deliverables_raw
-    deliverables_items = [
-        re.sub(r'^\d+[).\-\s]*', '', item).strip()
-        for item in re.split(r'<br\s*/?>', deliverables_raw)
-        if item and item.strip()
-    ]
+    # Only the first four items are used; stop cleaning items after that
+    deliverables_items = list(islice(
+        (
+            _LEAD_NUM_RE.sub('', item).strip()
+            for item in _BR_RE.split(deliverables_raw)
+            if item and item.strip()
+        ),
+        4,
+    ))
 
     for idx in range(4):
         placeholders[f'SOLUTION_POINT_{idx + 1}'] = (
             deliverables_items[idx] if idx < len(deliverables_items) else ''
         )
 
-    placeholders['TIMELINE'] = escape_html(data.get('timeline', ''))
-    
     # Why Us section
     why_us = data.get('why_us', [])
     if len(why_us) >= 1:
@@ -193,20 +310,12 @@ def build_placeholder_map(data: Dict[str, Any], logo_path: Optional[Path] = None
     
     # Investment section
     investment_raw = str(data.get('investment', '')).strip()
-    plan_details = {
-        "Starter subscription - flat monthly plan": ("Starter", "JMD 85,000 / month"),
-        "Growth subscription - flat monthly plan": ("Growth", "JMD 240,000 / month"),
-        "Strategic Partner subscription - flat monthly plan": ("Strategic Partner", "JMD 650,000 / month"),
-        "Flat monthly subscription - plan to be confirmed": ("Flat monthly subscription - plan to be confirmed", ""),
-    }
-    plan_label, plan_price = plan_details.get(investment_raw, (investment_raw, ""))
+    plan_label, plan_price = _PLAN_DETAILS.get(investment_raw, (investment_raw, ""))
     placeholders['INVESTMENT'] = escape_html(investment_raw)
     placeholders['INVESTMENT_PLAN'] = escape_html(plan_label)
     placeholders['INVESTMENT_PRICE'] = escape_html(plan_price)
     # Don't escape - intentionally contains HTML like <br>
     placeholders['BANK_DETAILS'] = str(data.get('bank_details', ''))
-    placeholders['MIN_TERM_LABEL'] = escape_html(data.get('min_term_label', 'Minimum Term'))
-    placeholders['MIN_TERM_VALUE'] = escape_html(data.get('min_term_value', ''))
     
     # Investment notes
     invest_notes = data.get('invest_notes', [])
@@ -217,11 +326,6 @@ def build_placeholder_map(data: Dict[str, Any], logo_path: Optional[Path] = None
         else:
             placeholders[f'INVEST_NOTE_{i+1}'] = ''
     
-    # Signature
-    placeholders['SIGNATURE_INSTRUCTION'] = escape_html(
-        data.get('signature_instruction', 'Please sign below to accept this proposal.')
-    )
-    
     return placeholders
 
 
@@ -229,7 +333,8 @@ def generate_proposal(
     template_path: Path,
     placeholders: Dict[str, str],
     output_path: Path,
-    hero_image_path: Optional[Path] = None
+    hero_image_path: Optional[Path] = None,
+    link_hero: bool = False
 ) -> Path:
     """
     Generate a proposal by replacing placeholders in the template.
@@ -239,46 +344,55 @@ def generate_proposal(
         placeholders: Dictionary of placeholder values
         output_path: Path to save the generated proposal
         hero_image_path: Optional path to hero image (will be embedded as data URI)
+        link_hero: Keep the relative hero image link and copy the image next to
+            the output instead of embedding it (~33% smaller HTML)
         
     Returns:
         Path to the generated proposal file
     """
-    # Read template
-    with open(template_path, 'r', encoding='utf-8') as f:
-        template_content = f.read()
-    
-    # Replace placeholders
-    result = template_content
-    replaced_count = 0
-    missing = []
-    
-    for key, value in placeholders.items():
-        placeholder = f'{{{{{key}}}}}'
-        if placeholder in result:
-            result = result.replace(placeholder, value)
-            replaced_count += 1
-    
-    # Embed hero image as data URI for portability
-    if hero_image_path and hero_image_path.exists():
-        try:
-            hero_data_uri = encode_image_to_data_uri(hero_image_path)
-            # Replace the CSS background-image reference
-            result = result.replace("url('./hero_image.jpg')", f"url('{hero_data_uri}')")
-            print(f"[OK] Embedded hero image: {hero_image_path.name}")
-        except Exception as e:
-            print(f"[WARN] Could not embed hero image: {e}")
-    
-    # Check for any remaining placeholders
-    remaining = re.findall(r'\{\{([A-Z_0-9]+)\}\}', result)
-    if remaining:
-        print(f"[WARN] Unreplaced placeholders: {remaining}")
+    parts = compile_template(template_path)
     
     # Ensure output directory exists
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    # Write output
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(result)
+    # Embed hero image as data URI for portability (or ship it alongside);
+    # without one the template keeps its relative link
+    hero_uri = f'./{HERO_FILENAME}'
+    if hero_image_path and hero_image_path.exists():
+        if link_hero:
+            hero_copy = output_path.parent / HERO_FILENAME
+            if hero_copy.resolve() != hero_image_path.resolve():
+                shutil.copyfile(hero_image_path, hero_copy)
+            print(f"[OK] Linked hero image: {hero_copy}")
+        else:
+            try:
+                hero_uri = encode_image_to_data_uri(hero_image_path)
+                print(f"[OK] Embedded hero image: {hero_image_path.name}")
+            except Exception as e:
+                print(f"[WARN] Could not embed hero image: {e}")
+    
+    # Stream the render: write each literal and its substitution straight to
+    # the file instead of building the whole document as a string.
+    # Unknown placeholders are left as-is and reported.
+    placeholders = {**placeholders, 'HERO_DATA_URI': hero_uri}
+    replaced_count = 0
+    missing = []
+    with open(output_path, 'w', encoding='utf-8', buffering=1 << 16) as f:
+        write = f.write
+        write(parts[0])
+        for i in range(1, len(parts), 2):
+            key = parts[i]
+            value = placeholders.get(key)
+            if value is None:
+                missing.append(key)
+                value = f'{{{{{key}}}}}'
+            else:
+                replaced_count += 1
+            write(value)
+            write(parts[i + 1])
+    
+    if missing:
+        print(f"[WARN] Unreplaced placeholders: {missing}")
     
     print(f"[OK] Generated proposal: {output_path}")
     print(f"     Replaced {replaced_count} placeholders")
@@ -299,6 +413,8 @@ def generate_proposal(
 @click.option('--company', default='InstantProd', help='Your company name')
 @click.option('--website', help='Client website')
 @click.option('--open-browser', is_flag=True, help='Open the proposal in browser after generating')
+@click.option('--link-hero', is_flag=True,
+              help='Link the hero image as a separate file instead of embedding it')
 def main(
     client_data: Optional[str],
     logo: Optional[str],
@@ -307,7 +423,8 @@ def main(
     client_name: Optional[str],
     company: str,
     website: Optional[str],
-    open_browser: bool
+    open_browser: bool,
+    link_hero: bool
 ):
     """
     Generate an HTML proposal from the template.
@@ -327,7 +444,7 @@ def main(
             'company': company,
             'client_name': client_name or 'Client',
             'website': website or '',
-            'date': datetime.now().strftime('%B %d, %Y'),
+            'date': today_str('%B %d, %Y'),
         }
     
     # Set up logo path (use default if not specified)
@@ -356,12 +473,12 @@ def main(
         output_path = Path(output)
     else:
         # Generate a filename based on client name
-        safe_name = re.sub(r'[^\w\-]', '_', data.get('client_name', 'client').lower())
-        date_str = datetime.now().strftime('%Y%m%d')
+        safe_name = data.get('client_name', 'client').lower().translate(_SAFE_NAME_TABLE)
+        date_str = today_str('%Y%m%d')
         output_path = PROPOSALS_DIR / f'{safe_name}_{date_str}.html'
     
     # Generate the proposal
-    result_path = generate_proposal(TEMPLATE_FILE, placeholders, output_path, hero_path)
+    result_path = generate_proposal(TEMPLATE_FILE, placeholders, output_path, hero_path, link_hero)
     
     # Open in browser if requested
     if open_browser:
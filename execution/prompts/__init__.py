@@ -0,0 +1,19 @@
+"""
+System prompts for the execution scripts.
+
+Each prompt lives in a <name>.txt file next to this module, so prompt edits
+don't touch code and the interpreter never has to tokenize a multi-KB string
+literal on start-up. Prompts are used verbatim: never format or interpolate
+them, so every request starts with a byte-identical prefix that OpenAI's
+prompt cache can reuse. Bump PROMPT_CACHE_KEY in analyze_transcript.py when
+proposal.txt changes.
+"""
+
+import functools
+from importlib import resources
+
+
+@functools.cache
+def get_prompt(name: str) -> str:
+    """Return the prompt stored in <name>.txt (read once per process)."""
+    return (resources.files(__name__) / f"{name}.txt").read_text(encoding="utf-8")
@@ -4,44 +4,81 @@ Quick Proposal Generator - All-in-one workflow.
 
 Usage:
     python execution/quick_proposal.py
+    python execution/quick_proposal.py --batch ".tmp/transcripts/*.txt" --workers 4
 
-This script will:
+Interactively, this script will:
 1. Prompt for client name
 2. Prompt for transcript (paste from Fireflies)
 3. Analyze transcript with AI
 4. Generate HTML proposal
 5. Deploy to Vercel
 6. Output the live URL
+
+With --batch, steps 3-6 run for every matching transcript file (client name
+taken from the file name), several clients at a time.
 """
 
+import io
 import os
 import sys
 import re
+import glob
+import threading
 import subprocess
 from pathlib import Path
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Optional
+
+import click
+
+# Sibling scripts, run in-process rather than as one interpreter per stage
+import analyze_transcript
+import generate_proposal
+import deploy_proposal
 
 # Setup paths
 PROJECT_ROOT = Path(__file__).parent.parent
 TRANSCRIPTS_DIR = PROJECT_ROOT / '.tmp' / 'transcripts'
 PROPOSALS_DIR = PROJECT_ROOT / '.tmp' / 'proposals'
 
+# Precompiled patterns
+_DASH_RUN_RE = re.compile(r'-{2,}')
+_VERCEL_URL_RE = re.compile(r'https://[^\s]+\.vercel\.app')
+
 # Ensure directories exist
 TRANSCRIPTS_DIR.mkdir(parents=True, exist_ok=True)
 PROPOSALS_DIR.mkdir(parents=True, exist_ok=True)
 
 
+def _slug_char(c: str):
+    if c.isspace() or c in '_-':
+        return '-'
+    return c if c.isalnum() else None  # None drops the character
+
+
+_SLUG_TABLE = generate_proposal.CharMap(_slug_char)
+
+
 def slugify(text: str) -> str:
     """Convert text to URL-safe slug."""
-    text = text.lower().strip()
-    text = re.sub(r'[^\w\s-]', '', text)
-    text = re.sub(r'[\s_-]+', '-', text)
+    text = text.lower().strip().translate(_SLUG_TABLE)
+    text = _DASH_RUN_RE.sub('-', text)
     return text[:50]  # Limit length
 
 
 def get_multiline_input(prompt: str) -> str:
-    """Get multi-line input from user. End with empty line or Ctrl+Z (Windows)."""
+    """
+    Get multi-line input from user. On a terminal the paste is taken in one read,
+    ended with Ctrl+D (Ctrl+Z, Enter on Windows); piped input ends at two empty
+    lines or EOF, as before.
+    """
     print(prompt)
+    if sys.stdin.isatty():
+        eof_keys = "Ctrl+Z then Enter" if os.name == 'nt' else "Ctrl+D"
+        print(f"(Paste your transcript, then press {eof_keys} on a new line to finish)")
+        print("-" * 50)
+        return sys.stdin.read().strip()
+
     print("(Paste your transcript, then press Enter twice to finish)")
     print("-" * 50)
     
@@ -65,104 +102,183 @@ def get_multiline_input(prompt: str) -> str:
     return "\n".join(lines).strip()
 
 
-def run_script(script_name: str, args: list) -> tuple[bool, str]:
-    """Run a Python script and return success status and output."""
-    cmd = [sys.executable, str(PROJECT_ROOT / 'execution' / script_name)] + args
+class _ThreadRoutedStream:
+    """
+    Stand-in for sys.stdout/sys.stderr that sends a thread's writes to its
+    capture buffer while run_step is active in that thread. Unlike
+    contextlib.redirect_stdout, this is safe with stages running in parallel.
+    """
+    _local = threading.local()
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    def write(self, text):
+        return (getattr(self._local, 'buffer', None) or self._stream).write(text)
+
+    def flush(self):
+        return (getattr(self._local, 'buffer', None) or self._stream).flush()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+def run_step(command, args: list) -> tuple[bool, str]:
+    """Run a sibling script's click command in-process and return success status and output."""
+    if not isinstance(sys.stdout, _ThreadRoutedStream):
+        sys.stdout = _ThreadRoutedStream(sys.stdout)
+        sys.stderr = _ThreadRoutedStream(sys.stderr)
     
+    buffer = io.StringIO()
+    _ThreadRoutedStream._local.buffer = buffer
     try:
-        result = subprocess.run(
-            cmd,
-            cwd=str(PROJECT_ROOT),
-            capture_output=True,
-            text=True,
-            shell=(os.name == 'nt')  # Windows compatibility
-        )
-        output = result.stdout + result.stderr
-        return result.returncode == 0, output
+        code = command.main(args, standalone_mode=False)
+    except SystemExit as e:
+        code = e.code
     except Exception as e:
-        return False, str(e)
+        buffer.write(str(e))
+        code = 1
+    finally:
+        _ThreadRoutedStream._local.buffer = None
+    return not code, buffer.getvalue()
 
 
-def main():
-    print("\n" + "=" * 60)
-    print("   INSTANTPROD QUICK PROPOSAL GENERATOR")
-    print("=" * 60 + "\n")
+def process_transcript(client_slug: str, transcript_file: Path,
+                       log: Callable[[str], None] = print) -> Optional[tuple[Path, str]]:
+    """
+    Analyze, generate and deploy one transcript.
+    Returns (proposal file, live URL), or None if a step failed.
+    """
+    date_str = generate_proposal.today_str('%Y%m%d')
     
-    # Step 1: Get client name
-    client_name = input("Client Name: ").strip()
-    if not client_name:
-        print("[ERROR] Client name is required.")
-        return 1
-    
-    client_slug = slugify(client_name)
-    date_str = datetime.now().strftime('%Y%m%d')
-    
-    # Step 2: Get transcript
-    print()
-    transcript = get_multiline_input("Paste Fireflies Transcript:")
-    
-    if len(transcript) < 50:
-        print("[ERROR] Transcript seems too short. Please paste the full call.")
-        return 1
-    
-    # Step 3: Save transcript
-    transcript_file = TRANSCRIPTS_DIR / f"{client_slug}_{date_str}.txt"
-    with open(transcript_file, 'w', encoding='utf-8') as f:
-        f.write(transcript)
-    print(f"\n[OK] Saved transcript: {transcript_file.name}")
-    
-    # Step 4: Analyze with AI
-    print("\n[...] Analyzing transcript with AI...")
-    success, output = run_script('analyze_transcript.py', [
+    # Analyze with AI
+    log("\n[...] Analyzing transcript with AI...")
+    success, output = run_step(analyze_transcript.main, [
         '--transcript', str(transcript_file)
     ])
     
     if not success:
-        print(f"[ERROR] Analysis failed:\n{output}")
-        return 1
+        log(f"[ERROR] Analysis failed:\n{output}")
+        return None
     
     # The JSON file is saved next to the transcript as `<stem>_data.json`
     json_file = transcript_file.parent / f"{transcript_file.stem}_data.json"
     
     if not json_file.exists():
-        print(f"[ERROR] Expected JSON not found: {json_file}")
-        return 1
+        log(f"[ERROR] Expected JSON not found: {json_file}")
+        return None
     
-    print(f"[OK] AI analysis complete: {json_file.name}")
+    log(f"[OK] AI analysis complete: {json_file.name}")
     
-    # Step 5: Generate HTML proposal
-    print("\n[...] Generating HTML proposal...")
+    # Generate HTML proposal
+    log("\n[...] Generating HTML proposal...")
     proposal_file = PROPOSALS_DIR / f"{client_slug}_{date_str}.html"
     
-    success, output = run_script('generate_proposal.py', [
+    success, output = run_step(generate_proposal.main, [
         '--client-data', str(json_file),
         '--output', str(proposal_file)
     ])
     
     if not success:
-        print(f"[ERROR] Generation failed:\n{output}")
-        return 1
+        log(f"[ERROR] Generation failed:\n{output}")
+        return None
     
-    print(f"[OK] Proposal generated: {proposal_file.name}")
+    log(f"[OK] Proposal generated: {proposal_file.name}")
     
-    # Step 6: Deploy to Vercel
-    print("\n[...] Deploying to Vercel...")
-    success, output = run_script('deploy_proposal.py', [
+    # Deploy to Vercel
+    log("\n[...] Deploying to Vercel...")
+    success, output = run_step(deploy_proposal.main, [
         '--proposal', str(proposal_file),
         '--client-slug', client_slug
     ])
     
     if not success:
-        print(f"[ERROR] Deployment failed:\n{output}")
-        return 1
+        log(f"[ERROR] Deployment failed:\n{output}")
+        return None
     
     # Extract URL from output
-    url_match = re.search(r'https://[^\s]+\.vercel\.app', output)
+    url_match = _VERCEL_URL_RE.search(output)
     if url_match:
         live_url = url_match.group(0)
     else:
         live_url = "(Check Vercel dashboard)"
     
+    return proposal_file, live_url
+
+
+def run_batch(pattern: str, workers: int) -> int:
+    """Run the pipeline for every transcript matching pattern, `workers` clients at a time."""
+    transcript_files = sorted(Path(p) for p in glob.glob(pattern) if p.endswith('.txt'))
+    if not transcript_files:
+        print(f"[ERROR] No .txt transcripts match: {pattern}")
+        return 1
+    
+    print(f"Processing {len(transcript_files)} transcripts with {workers} workers...")
+    print_lock = threading.Lock()
+    
+    def _process(transcript_file: Path):
+        client_slug = slugify(transcript_file.stem)
+        
+        def log(message: str):
+            with print_lock:
+                print(f"[{client_slug}] {message.strip()}")
+        
+        return client_slug, process_transcript(client_slug, transcript_file, log)
+    
+    results = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_process, path) for path in transcript_files]
+        for future in as_completed(futures):
+            results.append(future.result())
+    
+    failures = 0
+    print("\n" + "=" * 60)
+    for client_slug, result in sorted(results, key=lambda r: r[0]):
+        if result is None:
+            failures += 1
+            print(f"   [FAIL] {client_slug}")
+        else:
+            print(f"   [OK]   {client_slug}: {result[1]}")
+    print("=" * 60)
+    print(f"   {len(results) - failures} succeeded, {failures} failed\n")
+    return 1 if failures else 0
+
+
+def run_interactive() -> int:
+    """Prompt for a client and transcript, then analyze, generate and deploy."""
+    print("\n" + "=" * 60)
+    print("   INSTANTPROD QUICK PROPOSAL GENERATOR")
+    print("=" * 60 + "\n")
+    
+    # Step 1: Get client name
+    client_name = input("Client Name: ").strip()
+    if not client_name:
+        print("[ERROR] Client name is required.")
+        return 1
+    
+    client_slug = slugify(client_name)
+    date_str = generate_proposal.today_str('%Y%m%d')
+    
+    # Step 2: Get transcript
+    print()
+    transcript = get_multiline_input("Paste Fireflies Transcript:")
+    
+    if len(transcript) < 50:
+        print("[ERROR] Transcript seems too short. Please paste the full call.")
+        return 1
+    
+    # Step 3: Save transcript
+    transcript_file = TRANSCRIPTS_DIR / f"{client_slug}_{date_str}.txt"
+    with open(transcript_file, 'w', encoding='utf-8') as f:
+        f.write(transcript)
+    print(f"\n[OK] Saved transcript: {transcript_file.name}")
+    
+    # Steps 4-6: Analyze, generate, deploy
+    result = process_transcript(client_slug, transcript_file)
+    if result is None:
+        return 1
+    proposal_file, live_url = result
+    
     # Final output
     print("\n" + "=" * 60)
     print("   SUCCESS!")
@@ -184,5 +300,18 @@ def main():
     return 0
 
 
+@click.command()
+@click.option('--batch', 'batch_pattern', default=None,
+              help='Glob of transcript .txt files to process without prompting (client name = file name)')
+@click.option('--workers', default=4, type=click.IntRange(1, 8), help='With --batch: clients processed at once')
+def main(batch_pattern: Optional[str], workers: int):
+    """Turn a pasted transcript into a live proposal (or a batch of them)."""
+    if batch_pattern:
+        sys.exit(run_batch(batch_pattern, workers))
+    sys.exit(run_interactive())
+
+
 if __name__ == '__main__':
-    sys.exit(main())
+    from dotenv import load_dotenv
+    load_dotenv()
+    main()
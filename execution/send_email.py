@@ -4,17 +4,17 @@ Send an email with attachment using the Gmail API.
 """
 
 import os
+import re
 import sys
 import base64
 import mimetypes
 from pathlib import Path
-from email.message import EmailMessage
+from email.message import EmailMessage, MIMEPart
 from typing import Optional, List
 
 import click
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
@@ -24,6 +24,12 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 import auth_helper
 
+try:
+    # SIMD base64; same API as the stdlib module
+    import pybase64 as b64
+except ImportError:
+    b64 = base64
+
 # Same scopes as test_google_auth.py
 SCOPES = [
     'https://www.googleapis.com/auth/spreadsheets',
@@ -55,11 +61,11 @@ def get_gmail_service(force_reauth: bool = False):
     """Get authenticated Gmail service."""
     
     # Restore credentials to standard paths (or /tmp)
-    creds_path, token_path = auth_helper.restore_credentials() # This handles Vercel /tmp logic
+    creds_path, token_path = auth_helper.credential_paths() # This handles Vercel /tmp logic
     
     creds = None
-    if not force_reauth and token_path.exists():
-        creds = Credentials.from_authorized_user_file(str(token_path), SCOPES)
+    if not force_reauth:
+        creds = auth_helper.load_user_credentials(token_path, SCOPES)
         if creds and not _has_required_scopes(creds, SCOPES):
             creds = None
     
@@ -68,20 +74,30 @@ def get_gmail_service(force_reauth: bool = False):
             print("Refreshing expired token...")
             creds.refresh(Request())
         else:
-            if not creds_path.exists():
-                raise FileNotFoundError(f"credentials.json not found at {creds_path}")
-            
             # Interactive flow (only works locally)
-            flow = InstalledAppFlow.from_client_secrets_file(
-                str(creds_path), SCOPES
-            )
+            flow = auth_helper.get_client_flow(creds_path, SCOPES)
             creds = flow.run_local_server(port=0, open_browser=False, access_type='offline', prompt='consent')
         
         # Save refreshed token
         with open(token_path, 'w') as token:
             token.write(creds.to_json())
             
-    return build('gmail', 'v1', credentials=creds)
+    # Bundled discovery document: no discovery fetch or file-cache lookup
+    return build('gmail', 'v1', credentials=creds, cache_discovery=False, static_discovery=True)
+
+def _attach_file(message: EmailMessage, file_path: Path, maintype: str, subtype: str):
+    """
+    Attach a file as a pre-encoded base64 part.
+    add_attachment() would base64 the bytes in 57-byte slices in Python;
+    encodebytes does the whole file (76-char MIME lines) in one call.
+    """
+    part = MIMEPart(policy=message.policy)
+    part['Content-Type'] = f'{maintype}/{subtype}'
+    part['Content-Transfer-Encoding'] = 'base64'
+    part.add_header('Content-Disposition', 'attachment', filename=file_path.name)
+    part.set_payload(b64.encodebytes(file_path.read_bytes()).decode('ascii'))
+    message.make_mixed()
+    message.attach(part)
 
 def create_message_with_attachment(
     sender: str,
@@ -126,17 +142,10 @@ def create_message_with_attachment(
         
         maintype, subtype = ctype.split('/', 1)
         
-        with open(attachment_path, 'rb') as f:
-            file_data = f.read()
-            message.add_attachment(
-                file_data,
-                maintype=maintype,
-                subtype=subtype,
-                filename=attachment_path.name
-            )
+        _attach_file(message, attachment_path, maintype, subtype)
 
     # Encode the message (base64url)
-    encoded_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
+    encoded_message = b64.urlsafe_b64encode(message.as_bytes()).decode('ascii')
     return {'raw': encoded_message}
 
 def send_message(service, user_id, message):
@@ -163,18 +172,21 @@ def _is_insufficient_gmail_scopes_error(err: HttpError) -> bool:
         or "insufficient authentication scopes" in text
     )
 
+_PLACEHOLDER_RE = re.compile(r'\{\{([A-Z_0-9]+)\}\}')
+
 def render_template(template_path: Path, replacements: dict) -> str:
-    """Load HTML template and replace placeholders."""
+    """Load HTML template and replace placeholders (unknown ones are left as-is)."""
     if not template_path.exists():
         return ""
     
     with open(template_path, 'r', encoding='utf-8') as f:
         content = f.read()
-        
-    for key, value in replacements.items():
-        content = content.replace(f'{{{{{key}}}}}', str(value))
-        
-    return content
+    
+    def _substitute(match) -> str:
+        value = replacements.get(match.group(1))
+        return match.group(0) if value is None else str(value)
+    
+    return _PLACEHOLDER_RE.sub(_substitute, content)
 
 @click.command()
 @click.option('--to', required=True, help='Recipient email address')
@@ -41,19 +41,28 @@ Usage:
 """
 
 import os
+import re
 import sys
 import json
+import time
 import click
+import threading
 from pathlib import Path
 from datetime import datetime
+from functools import lru_cache
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any
 from dotenv import load_dotenv
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
@@ -61,12 +70,8 @@ load_dotenv()
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-try:
-    import auth_helper
-    CREDENTIALS_FILE, TOKEN_FILE = auth_helper.restore_credentials()
-except ImportError:
-    CREDENTIALS_FILE = PROJECT_ROOT / 'credentials.json'
-    TOKEN_FILE = PROJECT_ROOT / 'token.json'
+import auth_helper
+CREDENTIALS_FILE, TOKEN_FILE = auth_helper.credential_paths()
 
 # Google Sheets API scope
 SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
@@ -75,30 +80,70 @@ SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
 DEFAULT_SHEET_ID = '1ZVww3zCFkyLtlj7jcUXbuh6MK0CoRViU23FegPTHOIU'
 ONBOARDING_SHEET_ID = os.getenv('ONBOARDING_SHEET_ID', DEFAULT_SHEET_ID)
 
+# Headers and spreadsheet metadata are cached per process; writes through
+# this module drop the cache for that spreadsheet (see invalidate_cache)
+METADATA_CACHE_TTL = 60  # seconds
+# (sheet_id, kind, sheet_name) -> (expires_at, value)
+_metadata_cache: Dict[tuple, tuple] = {}
 
+
+# Credentials loaded by get_sheets_service(); worker threads build
+# their own service from them (the client's http isn't thread-safe)
+_CREDENTIALS = None
+_thread_local = threading.local()
+
+
+@lru_cache(maxsize=1)
 def get_sheets_service():
-    """Authenticate and return Google Sheets service."""
-    creds = None
-    
-    if TOKEN_FILE.exists():
-        creds = Credentials.from_authorized_user_file(str(TOKEN_FILE), SCOPES)
+    """
+    Authenticate and return Google Sheets service (shared per process).
+    Built from the discovery document bundled with the client library, so
+    no discovery request is made.
+    """
+    global _CREDENTIALS
+    creds = auth_helper.load_user_credentials(TOKEN_FILE, SCOPES)
     
     if not creds or not creds.valid:
         if creds and creds.expired and creds.refresh_token:
             creds.refresh(Request())
         else:
-            if not CREDENTIALS_FILE.exists():
-                raise FileNotFoundError(f"credentials.json not found at: {CREDENTIALS_FILE}")
-            
-            flow = InstalledAppFlow.from_client_secrets_file(
-                str(CREDENTIALS_FILE), SCOPES
-            )
+            flow = auth_helper.get_client_flow(CREDENTIALS_FILE, SCOPES)
             creds = flow.run_local_server(port=0, access_type='offline', prompt='consent')
         
         with open(TOKEN_FILE, 'w') as token:
             token.write(creds.to_json())
     
-    return build('sheets', 'v4', credentials=creds)
+    _CREDENTIALS = creds
+    return build('sheets', 'v4', credentials=creds, cache_discovery=False, static_discovery=True)
+
+
+def _worker_service():
+    """Sheets service owned by the calling thread, built on first use."""
+    service = getattr(_thread_local, 'service', None)
+    if service is None:
+        service = build('sheets', 'v4', credentials=_CREDENTIALS, cache_discovery=False, static_discovery=True)
+        _thread_local.service = service
+    return service
+
+
+def _cache_get(key: tuple):
+    entry = _metadata_cache.get(key)
+    if entry is None or entry[0] < time.monotonic():
+        return None
+    return entry[1]
+
+
+def _cache_put(key: tuple, value):
+    _metadata_cache[key] = (time.monotonic() + METADATA_CACHE_TTL, value)
+
+
+def invalidate_cache(sheet_id: Optional[str] = None):
+    """Forget cached headers/metadata for a spreadsheet (or for all of them)."""
+    if sheet_id is None:
+        _metadata_cache.clear()
+        return
+    for key in [key for key in _metadata_cache if key[0] == sheet_id]:
+        del _metadata_cache[key]
 
 
 def get_sheet_id(sheet_name: Optional[str] = None) -> str:
@@ -108,6 +153,23 @@ def get_sheet_id(sheet_name: Optional[str] = None) -> str:
     return ONBOARDING_SHEET_ID
 
 
+# column index -> A1 column letters
+_COL_CACHE: Dict[int, str] = {}
+
+
+def col_letter(index: int) -> str:
+    """Convert a 0-based column index to its A1 letters (A=0, ..., Z=25, AA=26, ...)."""
+    letters = _COL_CACHE.get(index)
+    if letters is None:
+        letters = ''
+        n = index + 1
+        while n:
+            n, rem = divmod(n - 1, 26)
+            letters = chr(65 + rem) + letters
+        _COL_CACHE[index] = letters
+    return letters
+
+
 def get_sheet_name_from_range(range_name: str) -> str:
     """Extract sheet name from range notation (e.g., 'Sheet1!A1' -> 'Sheet1')."""
     if '!' in range_name:
@@ -143,8 +205,7 @@ def read_sheet(service, sheet_id: str, range_name: str = None, sheet_name: str =
         
         for row in values[1:]:
             # Pad row to match header length
-            while len(row) < len(headers):
-                row.append('')
+            row.extend([''] * (len(headers) - len(row)))
             
             row_dict = dict(zip(headers, row))
             rows.append(row_dict)
@@ -187,6 +248,7 @@ def append_row(service, sheet_id: str, values: List[Any], sheet_name: str = 'She
             insertDataOption='INSERT_ROWS',
             body=body
         ).execute()
+        invalidate_cache(sheet_id)
         return result
     except HttpError as e:
         print(f"[ERROR] Failed to append row: {e}")
@@ -208,12 +270,37 @@ def update_row(service, sheet_id: str, row_index: int, values: List[Any], sheet_
             valueInputOption='USER_ENTERED',
             body=body
         ).execute()
+        invalidate_cache(sheet_id)
         return result
     except HttpError as e:
         print(f"[ERROR] Failed to update row: {e}")
         return None
 
 
+def update_rows(service, sheet_id: str, rows: Dict[int, List[Any]], sheet_name: str = 'Sheet1'):
+    """Update several rows in one request. rows maps row index (1-indexed, including header) to values."""
+    data = [
+        {'range': f'{sheet_name}!A{row_index}:Z{row_index}', 'values': [values]}
+        for row_index, values in rows.items()
+    ]
+    
+    body = {
+        'valueInputOption': 'USER_ENTERED',
+        'data': data
+    }
+    
+    try:
+        result = service.spreadsheets().values().batchUpdate(
+            spreadsheetId=sheet_id,
+            body=body
+        ).execute()
+        invalidate_cache(sheet_id)
+        return result
+    except HttpError as e:
+        print(f"[ERROR] Failed to update rows: {e}")
+        return None
+
+
 def update_cell(service, sheet_id: str, cell: str, value: Any, sheet_name: str = 'Sheet1', use_formula: bool = False):
     """Update a single cell. Cell can be 'A1' or 'Sheet1!A1' format."""
     if '!' in cell:
@@ -236,6 +323,7 @@ def update_cell(service, sheet_id: str, cell: str, value: Any, sheet_name: str =
             valueInputOption='USER_ENTERED' if use_formula else 'RAW',
             body=body
         ).execute()
+        invalidate_cache(sheet_id)
         return result
     except HttpError as e:
         print(f"[ERROR] Failed to update cell: {e}")
@@ -270,6 +358,7 @@ def batch_update_cells(service, sheet_id: str, updates: Dict[str, Any], sheet_na
             spreadsheetId=sheet_id,
             body=body
         ).execute()
+        invalidate_cache(sheet_id)
         return result
     except HttpError as e:
         print(f"[ERROR] Failed to batch update: {e}")
@@ -278,15 +367,19 @@ def batch_update_cells(service, sheet_id: str, updates: Dict[str, Any], sheet_na
 
 def get_headers(service, sheet_id: str, sheet_name: str = 'Sheet1') -> List[str]:
     """Get column headers without reading entire sheet (privacy-conscious)."""
+    key = (sheet_id, 'headers', sheet_name)
+    headers = _cache_get(key)
+    if headers is not None:
+        return list(headers)
     try:
         result = service.spreadsheets().values().get(
             spreadsheetId=sheet_id,
             range=f'{sheet_name}!A1:Z1'
         ).execute()
         values = result.get('values', [[]])
-        if values and len(values) > 0:
-            return values[0]
-        return []
+        headers = values[0] if values else []
+        _cache_put(key, headers)
+        return list(headers)
     except HttpError as e:
         print(f"[ERROR] Failed to get headers: {e}")
         return []
@@ -294,16 +387,11 @@ def get_headers(service, sheet_id: str, sheet_name: str = 'Sheet1') -> List[str]
 
 def get_row_count(service, sheet_id: str, sheet_name: str = 'Sheet1') -> int:
     """Get approximate row count without reading data (privacy-conscious)."""
-    try:
-        # Get metadata which includes row count
-        result = service.spreadsheets().get(spreadsheetId=sheet_id).execute()
-        for sheet in result.get('sheets', []):
-            if sheet.get('properties', {}).get('title') == sheet_name:
-                return sheet.get('properties', {}).get('gridProperties', {}).get('rowCount', 0)
-        return 0
-    except HttpError as e:
-        print(f"[ERROR] Failed to get row count: {e}")
-        return 0
+    # Metadata includes the row count (and is usually cached already)
+    for sheet in list_sheets(service, sheet_id):
+        if sheet.get('title') == sheet_name:
+            return sheet.get('rowCount') or 0
+    return 0
 
 
 def query_specific_range(service, sheet_id: str, range_name: str) -> List[List[Any]]:
@@ -319,58 +407,122 @@ def query_specific_range(service, sheet_id: str, range_name: str) -> List[List[A
         return []
 
 
-def find_rows(service, sheet_id: str, query: str, column: Optional[str] = None, sheet_name: str = 'Sheet1', exact_match: bool = False, limit_rows: Optional[int] = None):
-    """Find rows containing a query string. Can limit rows read for privacy."""
-    # If column is specified, we can be more efficient
-    if column:
-        headers = get_headers(service, sheet_id, sheet_name)
+# find_rows with a column reads just that column and the matching rows only
+# when limit_rows is at most this; otherwise it reads the sheet once
+PER_ROW_READ_MAX_LIMIT = 20
+
+# Ranges per values.batchGet request (they travel in the URL query string)
+BATCH_GET_RANGES = 100
+# batchGet requests in flight at once when there are more ranges than that
+BATCH_GET_CONCURRENCY = 4
+
+
+def _batch_get(service, sheet_id: str, ranges: List[str]) -> List[List[List[Any]]]:
+    result = service.spreadsheets().values().batchGet(
+        spreadsheetId=sheet_id,
+        ranges=ranges
+    ).execute()
+    return [value_range.get('values', []) for value_range in result.get('valueRanges', [])]
+
+
+def query_ranges(service, sheet_id: str, ranges: List[str]) -> List[List[List[Any]]]:
+    """
+    Query several ranges with values.batchGet; returns each range's values, in order.
+    More than BATCH_GET_RANGES ranges are split over concurrent requests.
+    """
+    chunks = [ranges[start:start + BATCH_GET_RANGES] for start in range(0, len(ranges), BATCH_GET_RANGES)]
+    results = []
+    try:
+        if len(chunks) > 1 and _CREDENTIALS is not None:
+            with ThreadPoolExecutor(max_workers=min(BATCH_GET_CONCURRENCY, len(chunks))) as executor:
+                for chunk_values in executor.map(lambda chunk: _batch_get(_worker_service(), sheet_id, chunk), chunks):
+                    results.extend(chunk_values)
+        else:
+            for chunk in chunks:
+                results.extend(_batch_get(service, sheet_id, chunk))
+    except HttpError as e:
+        print(f"[ERROR] Failed to query ranges: {e}")
+    return results
+
+
+def _match_positions(cells: List[str], query_lower: str, exact_match: bool) -> List[int]:
+    """Positions of the non-empty cells that match query_lower (case-insensitive), in order."""
+    if exact_match:
+        return [pos for pos, cell in enumerate(cells) if cell and cell.lower() == query_lower]
+    return [pos for pos, cell in enumerate(cells) if cell and query_lower in cell.lower()]
+
+
+def _match_sheet_rows(values: List[List[Any]], column: str, query_lower: str, exact_match: bool, limit_rows: Optional[int] = None) -> List[tuple]:
+    """(row_number, row) for the rows of a whole-sheet read whose column matches; row 1 is the headers."""
+    if not values or column not in values[0]:
+        return []
+    
+    col_index = values[0].index(column)
+    rows = values[1:]  # Skip header
+    cells = [str(row[col_index]) if col_index < len(row) else '' for row in rows]
+    positions = _match_positions(cells, query_lower, exact_match)
+    if limit_rows:
+        positions = positions[:limit_rows]
+    return [(pos + 2, rows[pos]) for pos in positions]  # +2: header, 1-indexing
+
+
+def find_rows(service, sheet_id: str, query: str, column: Optional[str] = None, sheet_name: str = 'Sheet1', exact_match: bool = False, limit_rows: Optional[int] = None, headers: Optional[List[str]] = None):
+    """
+    Find rows containing a query string. Can limit rows read for privacy.
+    Pass headers if the caller already has them to skip re-reading row 1.
+    
+    With a column and a limit_rows of at most PER_ROW_READ_MAX_LIMIT, only
+    that column and the matching rows are read (privacy-conscious, but three
+    requests). Otherwise the sheet is read once and scanned locally, which
+    is a single request however many rows match.
+    """
+    query_lower = query.lower()
+    
+    # Small limits: read the column, then just the rows that match
+    if column and limit_rows and limit_rows <= PER_ROW_READ_MAX_LIMIT:
+        if headers is None:
+            headers = get_headers(service, sheet_id, sheet_name)
         if column not in headers:
             return []
         
-        col_index = headers.index(column)
-        # Convert column index to letter (A=0, B=1, ..., Z=25, AA=26, etc.)
-        if col_index < 26:
-            col_letter = chr(65 + col_index)
-        else:
-            first_letter = chr(65 + (col_index // 26) - 1)
-            second_letter = chr(65 + (col_index % 26))
-            col_letter = first_letter + second_letter
+        letter = col_letter(headers.index(column))
         
         # Read only the specific column (more privacy-conscious)
-        col_range = f'{sheet_name}!{col_letter}:{col_letter}'
+        col_range = f'{sheet_name}!{letter}:{letter}'
         col_values = query_specific_range(service, sheet_id, col_range)
         
-        # Find matching rows
+        # Find matching row numbers (+2: skipped header, 1-indexing)
+        cells = [str(row[0]) if row else '' for row in col_values[1:]]
+        match_rows = [pos + 2 for pos in _match_positions(cells, query_lower, exact_match)]
+        match_rows = match_rows[:limit_rows]
+        
+        # Read only the rows that match, all in one request
+        row_ranges = [f'{sheet_name}!A{i}:Z{i}' for i in match_rows]
+        matches = []
+        for i, row_data in zip(match_rows, query_ranges(service, sheet_id, row_ranges)):
+            if row_data:
+                row_values = row_data[0]
+                row_values.extend([''] * (len(headers) - len(row_values)))
+                row_dict = dict(zip(headers, row_values))
+                matches.append({
+                    'row_number': i,
+                    'data': row_dict
+                })
+        
+        return matches
+    
+    # Column search: one read of the whole sheet, matched on that column locally
+    if column:
+        values = read_raw_values(service, sheet_id, f'{sheet_name}!A:Z')
+        headers = values[0] if values else []
         matches = []
-        query_lower = query.lower()
         
-        for i, row in enumerate(col_values[1:], start=2):  # Skip header
-            if not row:
-                continue
-            cell_value = str(row[0] if row else '').lower()
-            
-            if exact_match:
-                match_found = cell_value == query_lower
-            else:
-                match_found = query_lower in cell_value
-            
-            if match_found:
-                # Only read the specific row that matches
-                row_range = f'{sheet_name}!A{i}:Z{i}'
-                row_data = query_specific_range(service, sheet_id, row_range)
-                if row_data:
-                    headers = get_headers(service, sheet_id, sheet_name)
-                    row_values = row_data[0]
-                    while len(row_values) < len(headers):
-                        row_values.append('')
-                    row_dict = dict(zip(headers, row_values))
-                    matches.append({
-                        'row_number': i,
-                        'data': row_dict
-                    })
-                    
-                    if limit_rows and len(matches) >= limit_rows:
-                        break
+        for row_number, row in _match_sheet_rows(values, column, query_lower, exact_match, limit_rows):
+            row.extend([''] * (len(headers) - len(row)))
+            matches.append({
+                'row_number': row_number,
+                'data': dict(zip(headers, row))
+            })
         
         return matches
     
@@ -381,22 +533,14 @@ def find_rows(service, sheet_id: str, query: str, column: Optional[str] = None,
         return []
     
     matches = []
-    query_lower = query.lower()
+    # Each row is searched as one lowered string with the cells NUL-separated
+    # (a character sheet cells can't hold): a substring search for contains,
+    # a NUL-delimited one for an exact cell match
+    needle = f'\0{query_lower}\0' if exact_match else query_lower
     
     for i, row in enumerate(data):
-        match_found = False
-        
-        # Search in all columns
-        for value in row.values():
-            cell_value = str(value).lower()
-            if exact_match:
-                if cell_value == query_lower:
-                    match_found = True
-                    break
-            else:
-                if query_lower in cell_value:
-                    match_found = True
-                    break
+        row_blob = '\0'.join(map(str, row.values())).lower()
+        match_found = needle in (f'\0{row_blob}\0' if exact_match else row_blob)
         
         if match_found:
             matches.append({
@@ -410,53 +554,73 @@ def find_rows(service, sheet_id: str, query: str, column: Optional[str] = None,
     return matches
 
 
+def _sheet_text(value: Any) -> str:
+    """How a written value reads back from the sheet (JSON booleans show as TRUE/FALSE)."""
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    return str(value)
+
+
 def update_by_match(service, sheet_id: str, match_column: str, match_value: str, updates: Dict[str, Any], sheet_name: str = 'Sheet1'):
     """Update rows that match a specific column value."""
-    matches = find_rows(service, sheet_id, match_value, column=match_column, sheet_name=sheet_name, exact_match=True)
+    # One read gives the headers (column order), the match column and the
+    # current rows
+    values = read_raw_values(service, sheet_id, f'{sheet_name}!A:Z')
+    matches = _match_sheet_rows(values, match_column, match_value.lower(), exact_match=True)
     
     if not matches:
         return {'updated': 0, 'message': 'No matching rows found'}
     
-    # Get headers to know column order
-    headers_result = service.spreadsheets().values().get(
-        spreadsheetId=sheet_id,
-        range=f'{sheet_name}!1:1'
-    ).execute()
-    
-    headers = headers_result.get('values', [[]])[0]
+    headers = values[0]
+    # Only the columns that exist, by index
+    column_updates = [(headers.index(key), value) for key, value in updates.items() if key in headers]
+    if not column_updates:
+        return {'updated': 0, 'error': True, 'message': f"None of the update columns exist: {', '.join(updates)}"}
     
-    updated_count = 0
-    for match in matches:
-        row_num = match['row_number']
-        
-        # Get current row
-        current_range = f'{sheet_name}!A{row_num}:Z{row_num}'
-        result = service.spreadsheets().values().get(
-            spreadsheetId=sheet_id,
-            range=current_range
-        ).execute()
-        
-        current_values = result.get('values', [[]])[0]
+    new_rows = {}
+    for row_num, current_values in matches:
+        # Skip rows that already hold these values (saves write quota on re-runs)
+        if all(
+            str(current_values[col_index] if col_index < len(current_values) else '') == _sheet_text(value)
+            for col_index, value in column_updates
+        ):
+            continue
         
         # Update specific columns
-        for key, value in updates.items():
-            if key in headers:
-                col_index = headers.index(key)
-                while len(current_values) <= col_index:
-                    current_values.append('')
-                current_values[col_index] = value
+        for col_index, value in column_updates:
+            current_values.extend([''] * (col_index + 1 - len(current_values)))
+            current_values[col_index] = value
         
-        update_row(service, sheet_id, row_num, current_values, sheet_name)
-        updated_count += 1
+        new_rows[row_num] = current_values
+    
+    unchanged_count = len(matches) - len(new_rows)
+    if not new_rows:
+        return {'updated': 0, 'unchanged': unchanged_count, 'message': f'All {unchanged_count} matching row(s) already up to date'}
+    
+    # Write every changed row back in one request
+    if update_rows(service, sheet_id, new_rows, sheet_name) is None:
+        return {'updated': 0, 'unchanged': unchanged_count, 'error': True, 'message': 'Failed to update matching rows'}
     
-    return {'updated': updated_count, 'message': f'Updated {updated_count} row(s)'}
+    updated_count = len(new_rows)
+    message = f'Updated {updated_count} row(s)'
+    if unchanged_count:
+        message += f', skipped {unchanged_count} already up to date'
+    return {'updated': updated_count, 'unchanged': unchanged_count, 'message': message}
 
 
 def get_sheet_metadata(service, sheet_id: str):
     """Get metadata about the spreadsheet (sheets, properties, etc.)."""
+    key = (sheet_id, 'metadata', None)
+    metadata = _cache_get(key)
+    if metadata is not None:
+        return metadata
     try:
-        result = service.spreadsheets().get(spreadsheetId=sheet_id).execute()
-        return {
+        # Only the properties used below, not every sheet's full grid/format data
+        result = service.spreadsheets().get(
+            spreadsheetId=sheet_id,
+            fields='properties.title,sheets.properties(sheetId,title,gridProperties(rowCount,columnCount))'
+        ).execute()
+        metadata = {
             'title': result.get('properties', {}).get('title', ''),
             'sheets': [
                 {
@@ -468,6 +632,8 @@ def get_sheet_metadata(service, sheet_id: str):
                 for sheet in result.get('sheets', [])
             ]
         }
+        _cache_put(key, metadata)
+        return metadata
     except HttpError as e:
         print(f"[ERROR] Failed to get metadata: {e}")
         return None
@@ -514,6 +680,7 @@ def delete_column(service, sheet_id: str, column_index: int, sheet_name: str = '
             spreadsheetId=sheet_id,
             body=body
         ).execute()
+        invalidate_cache(sheet_id)
         
         return result
     except HttpError as e:
@@ -539,17 +706,8 @@ def rename_column(service, sheet_id: str, old_name: str, new_name: str, sheet_na
         print(f"[ERROR] Column '{old_name}' not found in headers")
         return None
     
-    column_index = headers.index(old_name)
-    # Convert column index to letter (A=0, B=1, etc.)
-    if column_index < 26:
-        col_letter = chr(65 + column_index)
-    else:
-        first_letter = chr(65 + (column_index // 26) - 1)
-        second_letter = chr(65 + (column_index % 26))
-        col_letter = first_letter + second_letter
-    
     # Update the header cell
-    cell_range = f'{sheet_name}!{col_letter}1'
+    cell_range = f'{sheet_name}!{col_letter(headers.index(old_name))}1'
     return update_cell(service, sheet_id, cell_range, new_name, sheet_name='', use_formula=False)
 
 
@@ -571,70 +729,89 @@ def query_by_column_value(service, sheet_id: str, column: str, value: str, sheet
     if column not in headers:
         return []
     
-    col_index = headers.index(column)
-    col_letter = chr(65 + col_index) if col_index < 26 else f"A{chr(65 + (col_index - 26))}"
+    letter = col_letter(headers.index(column))
     
     # Read only the specific column
-    col_range = f'{sheet_name}!{col_letter}:{col_letter}'
+    col_range = f'{sheet_name}!{letter}:{letter}'
     col_values = query_specific_range(service, sheet_id, col_range)
     
-    matches = []
-    value_lower = value.lower()
+    # Determine which columns to return (the row reads only span those)
+    ret_columns = [ret_col for ret_col in return_columns if ret_col in headers] if return_columns else []
+    ret_indices = [headers.index(ret_col) for ret_col in ret_columns]
     
-    for i, row in enumerate(col_values[1:], start=2):  # Skip header
-        if not row:
-            continue
-        cell_value = str(row[0] if row else '').lower()
-        
-        if cell_value == value_lower:
-            # Determine which columns to return
+    if ret_indices:
+        first_index = min(ret_indices)
+        start_col = col_letter(first_index)
+        end_col = col_letter(max(ret_indices))
+        # Requested cells by offset from the range start, picked in one call per row
+        offsets = [idx - first_index for idx in ret_indices]
+        width = max(offsets) + 1
+        pick = itemgetter(*offsets) if len(offsets) > 1 else lambda row: (row[offsets[0]],)
+    else:
+        start_col, end_col = 'A', 'Z'
+        width, pick = 0, lambda row: ()
+    
+    # Find matching row numbers (+2: skipped header, 1-indexing)
+    cells = [str(row[0]) if row else '' for row in col_values[1:]]
+    match_rows = [pos + 2 for pos in _match_positions(cells, value.lower(), exact_match=True)]
+    
+    # Read only the matching rows, all in one request
+    row_ranges = [f'{sheet_name}!{start_col}{i}:{end_col}{i}' for i in match_rows]
+    matches = []
+    for i, row_data in zip(match_rows, query_ranges(service, sheet_id, row_ranges)):
+        if row_data:
+            row_values = row_data[0]
             if return_columns:
-                # Build range for specific columns only
-                col_indices = []
-                for ret_col in return_columns:
-                    if ret_col in headers:
-                        col_indices.append(headers.index(ret_col))
-                
-                if col_indices:
-                    def index_to_letter(idx):
-                        if idx < 26:
-                            return chr(65 + idx)
-                        else:
-                            first = chr(65 + (idx // 26) - 1)
-                            second = chr(65 + (idx % 26))
-                            return first + second
-                    start_col = index_to_letter(min(col_indices))
-                    end_col = index_to_letter(max(col_indices))
-                    row_range = f'{sheet_name}!{start_col}{i}:{end_col}{i}'
-                else:
-                    row_range = f'{sheet_name}!A{i}:Z{i}'
+                # Filter to only requested columns
+                row_values.extend([''] * (width - len(row_values)))
+                row_dict = dict(zip(ret_columns, pick(row_values)))
             else:
-                row_range = f'{sheet_name}!A{i}:Z{i}'
+                # Return all columns
+                row_values.extend([''] * (len(headers) - len(row_values)))
+                row_dict = dict(zip(headers, row_values))
             
-            row_data = query_specific_range(service, sheet_id, row_range)
-            if row_data:
-                row_values = row_data[0]
-                if return_columns:
-                    # Filter to only requested columns
-                    row_dict = {}
-                    for ret_col in return_columns:
-                        if ret_col in headers:
-                            col_idx = headers.index(ret_col)
-                            row_dict[ret_col] = row_values[col_idx] if col_idx < len(row_values) else ''
-                else:
-                    # Return all columns
-                    while len(row_values) < len(headers):
-                        row_values.append('')
-                    row_dict = dict(zip(headers, row_values))
-                
-                matches.append({
-                    'row_number': i,
-                    'data': row_dict
-                })
+            matches.append({
+                'row_number': i,
+                'data': row_dict
+            })
     
     return matches
 
 
+_NON_ASCII = re.compile(r'[^\x00-\x7f]')
+
+
+def _json_escape(match) -> str:
+    """\\uXXXX escape for one non-ASCII character (surrogate pair above the BMP), as json.dumps does."""
+    code = ord(match.group())
+    if code > 0xFFFF:
+        code -= 0x10000
+        return '\\u{:04x}\\u{:04x}'.format(0xD800 | (code >> 10), 0xDC00 | (code & 0x3FF))
+    return '\\u{:04x}'.format(code)
+
+
+def print_json(data: Any):
+    """
+    Print data as indented JSON; with orjson, written straight to stdout as bytes.
+    Output stays ASCII-only (non-ASCII escaped as \\uXXXX, like json.dumps) so
+    callers reading it with the locale encoding (cp1252 on Windows) can decode it.
+    """
+    if orjson is None:
+        print(json.dumps(data, indent=2, default=str))
+        return
+    output = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE, default=str)
+    if not output.isascii():
+        output = _NON_ASCII.sub(_json_escape, output.decode('utf-8')).encode('ascii')
+    stdout_bytes = getattr(sys.stdout, 'buffer', None)
+    if stdout_bytes is None:
+        # stdout replaced by a text-only stream (e.g. captured in-process)
+        sys.stdout.write(output.decode('utf-8'))
+        return
+    sys.stdout.flush()
+    stdout_bytes.write(output)
+    stdout_bytes.flush()
+
+
 @click.command()
 @click.option('--action', type=click.Choice([
     'read', 'add', 'update', 'update-cell', 'batch-update', 
@@ -698,7 +875,7 @@ def main(action, sheet_id, sheet_name, data, row, cell, value, updates, query, c
     if action == 'read':
         rows = read_sheet(service, target_sheet_id, range_name=range, sheet_name=sheet_name)
         print(f"\n[OK] Found {len(rows)} rows:\n")
-        print(json.dumps(rows, indent=2, default=str))
+        print_json(rows)
     
     elif action == 'add':
         if not data:
@@ -708,12 +885,7 @@ def main(action, sheet_id, sheet_name, data, row, cell, value, updates, query, c
         data_dict = json.loads(data)
         
         # Get headers to know column order
-        headers_result = service.spreadsheets().values().get(
-            spreadsheetId=target_sheet_id,
-            range=f'{sheet_name}!1:1'
-        ).execute()
-        
-        headers = headers_result.get('values', [[]])[0]
+        headers = get_headers(service, target_sheet_id, sheet_name)
         
         # Build row in header order
         values = [data_dict.get(h, '') for h in headers]
@@ -741,19 +913,13 @@ def main(action, sheet_id, sheet_name, data, row, cell, value, updates, query, c
         current_values = result.get('values', [[]])[0]
         
         # Get headers
-        headers_result = service.spreadsheets().values().get(
-            spreadsheetId=target_sheet_id,
-            range=f'{sheet_name}!1:1'
-        ).execute()
-        
-        headers = headers_result.get('values', [[]])[0]
+        headers = get_headers(service, target_sheet_id, sheet_name)
         
         # Update specific columns
         for key, value in data_dict.items():
             if key in headers:
                 col_index = headers.index(key)
-                while len(current_values) <= col_index:
-                    current_values.append('')
+                current_values.extend([''] * (col_index + 1 - len(current_values)))
                 current_values[col_index] = value
         
         result = update_row(service, target_sheet_id, row, current_values, sheet_name)
@@ -793,6 +959,9 @@ def main(action, sheet_id, sheet_name, data, row, cell, value, updates, query, c
         
         updates_dict = json.loads(data)
         result = update_by_match(service, target_sheet_id, match_column, match_value, updates_dict, sheet_name)
+        if result.get('error'):
+            print(f"[ERROR] {result['message']}")
+            return 1
         print(f"[OK] {result['message']}")
     
     elif action == 'find':
@@ -802,12 +971,12 @@ def main(action, sheet_id, sheet_name, data, row, cell, value, updates, query, c
         
         matches = find_rows(service, target_sheet_id, query, column=column, sheet_name=sheet_name, exact_match=exact_match, limit_rows=limit_rows)
         print(f"\n[OK] Found {len(matches)} matches:\n")
-        print(json.dumps(matches, indent=2, default=str))
+        print_json(matches)
     
     elif action == 'get-headers':
         headers_info = get_headers_only(service, target_sheet_id, sheet_name)
         print("\n[OK] Sheet Structure:\n")
-        print(json.dumps(headers_info, indent=2, default=str))
+        print_json(headers_info)
     
     elif action == 'query-range':
         if not range:
@@ -816,7 +985,7 @@ def main(action, sheet_id, sheet_name, data, row, cell, value, updates, query, c
         
         values = query_specific_range(service, target_sheet_id, range)
         print(f"\n[OK] Query Results ({len(values)} rows):\n")
-        print(json.dumps(values, indent=2, default=str))
+        print_json(values)
     
     elif action == 'query-by-column':
         if not column or not query:
@@ -829,20 +998,20 @@ def main(action, sheet_id, sheet_name, data, row, cell, value, updates, query, c
         
         matches = query_by_column_value(service, target_sheet_id, column, query, sheet_name, return_cols)
         print(f"\n[OK] Found {len(matches)} matches:\n")
-        print(json.dumps(matches, indent=2, default=str))
+        print_json(matches)
     
     elif action == 'metadata':
         metadata = get_sheet_metadata(service, target_sheet_id)
         if metadata:
             print("\n[OK] Sheet Metadata:\n")
-            print(json.dumps(metadata, indent=2, default=str))
+            print_json(metadata)
         else:
             return 1
     
     elif action == 'list-sheets':
         sheets = list_sheets(service, target_sheet_id)
         print(f"\n[OK] Found {len(sheets)} sheet(s):\n")
-        print(json.dumps(sheets, indent=2, default=str))
+        print_json(sheets)
     
     elif action == 'delete-column':
         if not column:
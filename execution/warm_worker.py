@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Warm worker for the execution scripts.
+
+Every `python execution/analyze_transcript.py` run pays interpreter start-up,
+the openai SDK import (pydantic, httpx, ...) and a fresh TLS connection before
+any work happens. This daemon keeps one process hot: it holds a single
+AsyncOpenAI client and serves jobs over a Unix socket. analyze_transcript.py
+hands its job to the daemon when the socket exists and falls back to running
+standalone otherwise.
+
+Protocol: one JSON object per line in each direction, one job per connection.
+    -> {"cmd": "analyze", "transcript": "/abs/path.txt", "output": "/abs/out.json",
+        "model": "gpt-5-nano", "additional_context": "..."}
+    <- {"ok": true, "output": "/abs/out.json"}   or   {"ok": false, "error": "..."}
+
+The socket lives in a directory only the current user can use:
+$XDG_RUNTIME_DIR, or ~/.cache/instantprod (mode 0700) where that isn't set.
+Clients only talk to a socket owned by their own user.
+
+Usage:
+    python execution/warm_worker.py                 # serve on the default socket
+    python execution/warm_worker.py --socket PATH   # or $INSTANTPROD_SOCKET
+"""
+
+import os
+import json
+import stat
+import socket
+import asyncio
+from pathlib import Path
+from typing import Optional
+
+import click
+from dotenv import load_dotenv
+
+
+def _default_socket_path() -> str:
+    runtime_dir = os.getenv("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "instantprod.sock")
+    return str(Path.home() / ".cache" / "instantprod" / "instantprod.sock")
+
+
+SOCKET_PATH = os.getenv("INSTANTPROD_SOCKET") or _default_socket_path()
+# Client side: how long to wait for a job before giving up on the daemon
+REQUEST_TIMEOUT = 300  # seconds
+
+
+# =============================================================================
+# CLIENT
+# =============================================================================
+
+def request(job: dict, socket_path: str = SOCKET_PATH) -> Optional[dict]:
+    """
+    Send a job to a running daemon and return its reply.
+    Returns None if no daemon is listening (callers then run standalone).
+    Raises TimeoutError if the daemon took the job but didn't answer in time;
+    it may still be working on it, so callers shouldn't re-run it.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    try:
+        st = os.stat(socket_path)
+    except OSError:
+        return None
+    if not stat.S_ISSOCK(st.st_mode) or st.st_uid != os.getuid():
+        # Someone else's socket: don't send them job paths and context
+        print(f"[WARN] Ignoring {socket_path}: not a socket owned by this user")
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(REQUEST_TIMEOUT)
+            sock.connect(socket_path)
+            sock.sendall(json.dumps(job).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as reader:
+                line = reader.readline()
+    except TimeoutError:
+        raise TimeoutError(f"Daemon did not answer within {REQUEST_TIMEOUT}s") from None
+    except OSError:
+        # Stale socket file or daemon went away mid-job
+        return None
+    if not line:
+        return None
+    return json.loads(line)
+
+
+# =============================================================================
+# SERVER
+# =============================================================================
+
+class Worker:
+    """Holds the warm clients and runs jobs."""
+
+    def __init__(self):
+        # Imported here so the client side above stays cheap to import
+        import openai
+        import analyze_transcript
+
+        self.analyzer = analyze_transcript
+        self.aclient = openai.AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.sem = asyncio.Semaphore(analyze_transcript.DEFAULT_CONCURRENCY)
+
+    async def analyze(self, job: dict) -> dict:
+        transcript_path = Path(job["transcript"])
+        output = job.get("output") or str(transcript_path.parent / f"{transcript_path.stem}_data.json")
+        transcript_text = await asyncio.to_thread(self.analyzer.read_text, transcript_path)
+        user_content = self.analyzer.build_user_content(transcript_text, job.get("additional_context"))
+        model = self.analyzer.resolve_model(job.get("model", "gpt-5-nano"), user_content)
+        data = await self.analyzer.analyze_text_async(self.aclient, model, user_content, self.sem)
+        await asyncio.to_thread(self.analyzer.write_data, data, output)
+        return {"ok": True, "output": output}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            job = json.loads(await reader.readline())
+            if job.get("cmd") == "analyze":
+                reply = await self.analyze(job)
+            else:
+                reply = {"ok": False, "error": f"Unknown command: {job.get('cmd')}"}
+        except Exception as e:
+            reply = {"ok": False, "error": str(e)}
+        writer.write(json.dumps(reply).encode("utf-8") + b"\n")
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+
+async def serve(socket_path: str):
+    worker = Worker()
+    # Jobs carry local file paths; only this user may submit them
+    socket_dir = os.path.dirname(socket_path)
+    if socket_dir and not os.path.isdir(socket_dir):
+        os.makedirs(socket_dir, mode=0o700)
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    # Create the socket file as 0600 rather than tightening it after bind
+    old_umask = os.umask(0o177)
+    try:
+        server = await asyncio.start_unix_server(worker.handle, path=socket_path)
+    finally:
+        os.umask(old_umask)
+    print(f"[OK] Daemon listening on {socket_path}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+@click.command()
+@click.option('--socket', 'socket_path', default=SOCKET_PATH, help='Unix socket path to listen on')
+def main(socket_path):
+    """Run the warm worker daemon."""
+    if not hasattr(socket, "AF_UNIX"):
+        print("[ERROR] Unix sockets are not available on this platform")
+        return 1
+    load_dotenv()
+    if not os.getenv("OPENAI_API_KEY"):
+        print("[ERROR] OPENAI_API_KEY not found in .env")
+        return 1
+    try:
+        asyncio.run(serve(socket_path))
+    except KeyboardInterrupt:
+        print("\nDaemon stopped.")
+    return 0
+
+
+if __name__ == '__main__':
+    main()
@@ -36,6 +36,7 @@ ChatGPT Connector Tools:
 import os
 import sys
 import json
+import asyncio
 import re
 import subprocess
 from pathlib import Path
@@ -59,7 +60,7 @@ sys.path.insert(0, str(PROJECT_ROOT))
 # Use auth_helper to get correct paths (handles Vercel /tmp)
 try:
     import auth_helper
-    CREDENTIALS_FILE, TOKEN_FILE = auth_helper.restore_credentials()
+    CREDENTIALS_FILE, TOKEN_FILE = auth_helper.credential_paths()
 except ImportError:
     CREDENTIALS_FILE = PROJECT_ROOT / 'credentials.json'
     TOKEN_FILE = PROJECT_ROOT / 'token.json'
@@ -73,13 +74,11 @@ else:
     
 TRANSCRIPTS_DIR = TMP_DIR / 'transcripts'
 PROPOSALS_DIR = TMP_DIR / 'proposals'
-DEPLOY_DIR = TMP_DIR / 'deploy'
 DIRECTIVES_DIR = PROJECT_ROOT / "directives" # This line was moved from above
 
 # Ensure directories exist
 TRANSCRIPTS_DIR.mkdir(parents=True, exist_ok=True)
 PROPOSALS_DIR.mkdir(parents=True, exist_ok=True)
-DEPLOY_DIR.mkdir(parents=True, exist_ok=True)
 
 # Initialize MCP server
 server = Server("instantprod-proposal-generator")
@@ -108,7 +107,6 @@ def run_script(script_name: str, args: list) -> tuple[bool, str]:
             cwd=str(PROJECT_ROOT),
             capture_output=True,
             text=True,
-            shell=(os.name == 'nt'),  # Windows compatibility
             timeout=120  # 2 minute timeout
         )
         output = result.stdout + result.stderr
@@ -119,6 +117,11 @@ def run_script(script_name: str, args: list) -> tuple[bool, str]:
         return False, str(e)
 
 
+async def run_script_async(script_name: str, args: list) -> tuple[bool, str]:
+    """Run a script in a worker thread so the event loop keeps serving other requests."""
+    return await asyncio.to_thread(run_script, script_name, args)
+
+
 def get_file_list(directory: Path, extension: str = "*") -> list[dict]:
     """Get list of files in a directory with metadata."""
     files = []
@@ -657,7 +660,7 @@ async def handle_analyze_transcript(args: dict) -> list[TextContent]:
     if context_file:
         cmd_args.extend(['--additional-context-path', str(context_file)])
 
-    success, output = run_script('analyze_transcript.py', cmd_args)
+    success, output = await run_script_async('analyze_transcript.py', cmd_args)
     
     if not success:
         return [TextContent(type="text", text=f"Analysis failed:\n{output}")]
@@ -670,8 +673,10 @@ async def handle_analyze_transcript(args: dict) -> list[TextContent]:
             data = json.load(f)
         
         # Auto-upload to Drive (Stateless persistence)
-        run_script('execution/drive_storage.py', ['--action', 'upload', '--file', str(transcript_file), '--folder', 'transcripts'])
-        run_script('execution/drive_storage.py', ['--action', 'upload', '--file', str(json_file), '--folder', 'transcripts'])
+        await asyncio.gather(
+            run_script_async('execution/drive_storage.py', ['--action', 'upload', '--file', str(transcript_file), '--folder', 'transcripts']),
+            run_script_async('execution/drive_storage.py', ['--action', 'upload', '--file', str(json_file), '--folder', 'transcripts']),
+        )
 
         return [TextContent(
             type="text",
@@ -714,7 +719,7 @@ async def handle_generate_proposal(args: dict) -> list[TextContent]:
             download_target = TRANSCRIPTS_DIR / filename
             client_data_path = str(download_target) # Update path for script
 
-        success, _ = run_script('execution/drive_storage.py', [
+        success, _ = await run_script_async('execution/drive_storage.py', [
             '--action', 'download', 
             '--file-id', filename, 
             '--output', str(download_target)
@@ -737,7 +742,7 @@ async def handle_generate_proposal(args: dict) -> list[TextContent]:
     output_file = PROPOSALS_DIR / f"{slug}_{date_str}.html"
     cmd_args.extend(['--output', str(output_file)])
     
-    success, output = run_script('generate_proposal.py', cmd_args)
+    success, output = await run_script_async('generate_proposal.py', cmd_args)
     
     if not success:
         return [TextContent(type="text", text=f"Generation failed:\n{output}")]
@@ -766,7 +771,7 @@ async def handle_deploy_proposal(args: dict) -> list[TextContent]:
         else:
             return [TextContent(type="text", text="Error: No proposal_path provided and no proposals found")]
     
-    success, output = run_script('deploy_proposal.py', [
+    success, output = await run_script_async('deploy_proposal.py', [
         '--proposal', proposal_path,
         '--client-slug', client_slug
     ])
@@ -798,7 +803,7 @@ async def handle_send_email(args: dict) -> list[TextContent]:
     if not all([to_email, client_name, proposal_link]):
         return [TextContent(type="text", text="Error: to_email, client_name, and proposal_link are required")]
     
-    success, output = run_script('send_email.py', [
+    success, output = await run_script_async('send_email.py', [
         '--to', to_email,
         '--subject', subject,
         '--body', f"Your proposal is ready: {proposal_link}",
@@ -846,7 +851,7 @@ async def handle_send_plain_email(args: dict) -> list[TextContent]:
             return [TextContent(type="text", text=f"Error: attachment_path not found: {attachment_path}")]
         cmd_args.extend(['--attachment', str(path)])
 
-    success, output = run_script('send_email.py', cmd_args)
+    success, output = await run_script_async('send_email.py', cmd_args)
 
     if not success:
         return [TextContent(type="text", text=f"Email failed:\n{output}")]
@@ -870,7 +875,7 @@ async def handle_send_trello_invite_email(args: dict) -> list[TextContent]:
     if not all([to_email, client_name, trello_link]):
         return [TextContent(type="text", text="Error: to_email, client_name, and trello_link are required")]
 
-    success, output = run_script('send_email.py', [
+    success, output = await run_script_async('send_email.py', [
         '--to', to_email,
         '--subject', subject,
         '--body', f"Your Trello board is ready: {trello_link}",
@@ -1001,7 +1006,7 @@ async def handle_read_sheet(args: dict) -> list[TextContent]:
     if range_name:
         cmd_args.extend(['--range', range_name])
     
-    success, output = run_script('sheets_manager.py', cmd_args)
+    success, output = await run_script_async('sheets_manager.py', cmd_args)
     
     if not success:
         return [TextContent(type="text", text=f"Sheet read failed:\n{output}")]
@@ -1024,7 +1029,7 @@ async def handle_find_client(args: dict) -> list[TextContent]:
     if exact_match:
         cmd_args.append('--exact-match')
     
-    success, output = run_script('sheets_manager.py', cmd_args)
+    success, output = await run_script_async('sheets_manager.py', cmd_args)
     
     if not success:
         return [TextContent(type="text", text=f"Search failed:\n{output}")]
@@ -1075,7 +1080,7 @@ async def handle_get_last_url(args: dict) -> list[TextContent]:
 
 async def handle_sync_to_drive(args: dict) -> list[TextContent]:
     """Sync all local files to Google Drive."""
-    success, output = run_script('drive_storage.py', ['--action', 'sync'])
+    success, output = await run_script_async('drive_storage.py', ['--action', 'sync'])
     
     if not success:
         return [TextContent(type="text", text=f"Drive sync failed:\n{output}")]
@@ -1096,7 +1101,7 @@ async def handle_list_drive_files(args: dict) -> list[TextContent]:
     """List files in Google Drive."""
     folder = args.get("folder", "proposals")
     
-    success, output = run_script('drive_storage.py', [
+    success, output = await run_script_async('drive_storage.py', [
         '--action', 'list',
         '--folder', folder
     ])
@@ -1118,7 +1123,7 @@ async def handle_download_from_drive(args: dict) -> list[TextContent]:
     output_path = TMP_DIR / "downloads" / output_name
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    success, output = run_script('drive_storage.py', [
+    success, output = await run_script_async('drive_storage.py', [
         '--action', 'download',
         '--file-id', file_id,
         '--output', str(output_path)
@@ -1293,5 +1298,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(main())